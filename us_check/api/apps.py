@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # 검색어 동의어 사전을 첫 요청 전에 컴파일
+        from tourism.synonyms import get_synonym_dictionary
+        get_synonym_dictionary()
@@ -5,6 +5,7 @@ Firestore 기반 관광지 추천 서비스
 import logging
 from typing import List, Dict, Optional
 from tourism.services import FirestoreTourismService
+from tourism.ranking import LocalSpotRanker
 from gemini_ai.services import GeminiAIService
 
 logger = logging.getLogger(__name__)
@@ -44,11 +45,11 @@ class FirestoreTourismRecommendationService:
             analysis = analysis_result.get('analysis', {})
             logger.info(f'쿼리 분석 결과: {analysis}')
             
-            # 2. 모든 관광지 데이터 가져오기
-            all_spots = self.get_all_spots()
+            # 2. 모든 관광지 데이터 가져오기 (카탈로그 캐시)
+            catalog = self.tourism_service.get_catalog()
             
             # 3. 분석 결과에 따라 필터링 및 추천
-            recommendations = self.filter_and_rank_spots(all_spots, analysis, limit)
+            recommendations = self.filter_and_rank_spots(catalog.spots, analysis, limit, catalog=catalog)
             
             return {
                 'success': True,
@@ -66,55 +67,17 @@ class FirestoreTourismRecommendationService:
                 'recommendations': []
             }
     
-    def filter_and_rank_spots(self, spots: List[Dict], analysis: Dict, limit: int) -> List[Dict]:
-        """분석 결과에 따라 관광지 필터링 및 랭킹"""
-        filtered_spots = []
-        
-        # 추출된 키워드들
-        keywords = analysis.get('keywords', [])
-        categories = analysis.get('categories', [])
-        locations = analysis.get('locations', [])
-        
-        for spot in spots:
-            score = 0
-            
-            # 키워드 매칭 점수
-            spot_text = ' '.join([
-                spot.get('name', ''),
-                spot.get('title', ''),
-                spot.get('description', ''),
-                spot.get('overview', ''),
-                spot.get('addr1', ''),
-                spot.get('category', ''),
-                ' '.join(spot.get('tags', []))
-            ]).lower()
-            
-            for keyword in keywords:
-                if keyword.lower() in spot_text:
-                    score += 10
-            
-            # 카테고리 매칭 점수
-            spot_category = spot.get('category', '').lower()
-            for category in categories:
-                if category.lower() in spot_category:
-                    score += 15
-            
-            # 위치 매칭 점수
-            spot_address = spot.get('addr1', '').lower()
-            for location in locations:
-                if location.lower() in spot_address:
-                    score += 20
-            
-            # 점수가 있는 관광지만 추가
-            if score > 0:
-                spot['recommendation_score'] = score
-                filtered_spots.append(spot)
+    def filter_and_rank_spots(self, spots: List[Dict], analysis: Dict, limit: int,
+                              catalog=None) -> List[Dict]:
+        """분석 결과에 따라 관광지 필터링 및 랭킹 (tourism.ranking.LocalSpotRanker 점수 사용)"""
+        ranker = LocalSpotRanker.for_catalog(catalog) if catalog is not None else LocalSpotRanker(spots)
         
-        # 점수순 정렬
-        filtered_spots.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
-        
-        # 상위 limit개만 반환
-        return filtered_spots[:limit]
+        # 점수가 있는 상위 limit개만 점수순으로 (캐시된 카탈로그 데이터는 수정하지 않음)
+        return [
+            dict(spot, recommendation_score=score)
+            for spot, score in ranker.rank_batch([analysis], limit)[0]
+            if score > 0
+        ]
     
     def save_user_selection(self, user_data: Dict) -> Dict:
         """사용자 선택 저장"""
@@ -2,19 +2,86 @@
 Firestore 기반 API 뷰
 Django ORM 대신 Firestore를 직접 사용하는 API 엔드포인트
 """
+import hashlib
 import json
 import logging
-from django.http import JsonResponse
+import re
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from .renderers import JsonResponse
 from .services import TourismRecommendationService
 from qr_service.services import QRCodeService
+from tourism.services import tourism_service as catalog_service
+from tourism.sampling import PachinkoFeed
+from tourism.clustering import SpotClusterIndex
+from tourism.similarity import SpotNeighbourIndex
+from tourism.autocomplete import SpotAutocomplete, DEFAULT_TOP_K
+from tourism.facets import FACETS, FacetIndex
+from tourism.taxonomy import TaxonomyIndex
+from tourism.catalog import catalog_cache
+from tourism.representations import SpotRepresentations
+from tourism.json_encoding import encode_json, extend_json, join_json, json_dumps
 
 logger = logging.getLogger(__name__)
 
+# /api/spots/ fields 파라미터: 최상위 필드 이름만 허용 (Firestore select() 필드 경로로 그대로 사용)
+SPOT_FIELD_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+MAX_SPOT_FIELDS = 30
+
+def spliced_json_response(payload, status=200):
+    """미리 인코딩된 관광지 JSON 조각(RawJSON)을 이어 붙인 응답"""
+    return HttpResponse(encode_json(payload), content_type='application/json', status=status)
+
+def catalog_etag(request, catalog) -> str:
+    """카탈로그 버전 + 요청 경로와 쿼리 파라미터로 만든 강한 ETag"""
+    params = sorted(request.GET.lists())
+    digest = hashlib.sha1(json_dumps([request.path, params])).hexdigest()[:16]
+    return f'"{catalog.version}-{digest}"'
+
+def check_not_modified(request):
+    """
+    조건부 GET - 유효한 카탈로그 캐시가 있을 때만 ETag를 계산 (Firestore 조회 없음)
+    반환: (ETag 또는 None, If-None-Match와 일치하면 304 응답 아니면 None)
+    리소스 조회/요청 검증 전에 실행되므로 구체적인 ETag만 비교 ('*'는 없는 관광지나 잘못된 요청에도 일치하므로 무시)
+    """
+    catalog = catalog_cache.peek()
+    if catalog is None:
+        return None, None
+    
+    etag = catalog_etag(request, catalog)
+    if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    # If-None-Match는 약한 비교 (W/ 접두사 무시)
+    if etag in (tag.removeprefix('W/') for tag in if_none_match):
+        return etag, with_cache_headers(HttpResponseNotModified(), etag)
+    return etag, None
+
+def with_cache_headers(response, etag):
+    """정상 응답에 ETag와 Cache-Control 지정 (ETag가 없거나 오류 응답이면 그대로 반환)"""
+    if etag and response.status_code in (200, 304):
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'API_CACHE_MAX_AGE', 60))
+    return response
+
+def parse_location(data):
+    """요청 데이터의 lat/lon을 (위도, 경도)로 변환, 없으면 None (잘못된 값이면 ValueError)"""
+    lat = data.get('lat')
+    lon = data.get('lon')
+    if lat in (None, '') and lon in (None, ''):
+        return None
+    
+    latitude = float(lat)
+    longitude = float(lon)
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        raise ValueError('좌표 범위를 벗어났습니다.')
+    return latitude, longitude
+
 @method_decorator(csrf_exempt, name='dispatch')
 class FirestoreQueryView(View):
     """Firestore 기반 자연어 쿼리 처리"""
@@ -35,6 +102,15 @@ class FirestoreQueryView(View):
                     'message': '검색어를 입력해주세요.'
                 }, status=400)
             
+            # 사용자 위치 (선택) - 가까운 관광지에 가중치
+            try:
+                location = parse_location(data)
+            except (TypeError, ValueError):
+                return JsonResponse({
+                    'success': False,
+                    'message': '잘못된 위치 정보입니다. lat/lon을 숫자로 입력해주세요.'
+                }, status=400)
+            
             # 사용자 정보 (인증된 경우)
             user = request.user if request.user.is_authenticated else None
             
@@ -42,7 +118,8 @@ class FirestoreQueryView(View):
             result = self.tourism_service.process_user_query(
                 user_query=user_query,
                 user=user,
-                session_id=session_id
+                session_id=session_id,
+                location=location
             )
             
             return JsonResponse(result)
@@ -59,6 +136,65 @@ class FirestoreQueryView(View):
                 'message': f'서버 오류: {str(e)}'
             }, status=500)
 
+@method_decorator(csrf_exempt, name='dispatch')
+class FirestoreBatchQueryView(View):
+    """여러 자연어 쿼리 일괄 처리 (키오스크, 오프라인 작업용)"""
+    
+    def __init__(self):
+        super().__init__()
+        self.tourism_service = TourismRecommendationService()
+    
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+            queries = data.get('queries', [])
+            session_id = data.get('session_id')
+            
+            # null, 숫자, 객체, 빈 문자열이 쿼리로 변환되어 Gemini 분석/선택 기록을 만들지 않도록 항목별 검증
+            if not isinstance(queries, list) or not all(isinstance(query, str) and query.strip() for query in queries):
+                return JsonResponse({
+                    'success': False,
+                    'message': 'queries는 비어 있지 않은 문자열 목록이어야 합니다.'
+                }, status=400)
+            
+            user_queries = [query.strip() for query in queries]
+            if not user_queries:
+                return JsonResponse({
+                    'success': False,
+                    'message': '검색어를 입력해주세요.'
+                }, status=400)
+            
+            max_size = getattr(settings, 'BATCH_QUERY_MAX_SIZE', 50)
+            if len(user_queries) > max_size:
+                return JsonResponse({
+                    'success': False,
+                    'message': f'한 번에 최대 {max_size}개의 쿼리만 처리할 수 있습니다.'
+                }, status=400)
+            
+            # 사용자 정보 (인증된 경우)
+            user = request.user if request.user.is_authenticated else None
+            
+            result = self.tourism_service.process_user_queries_batch(
+                user_queries=user_queries,
+                user=user,
+                session_id=session_id
+            )
+            
+            # 입력 검증은 위에서 끝났으므로 처리 실패는 서버 오류 (Gemini/Firestore 장애 등)
+            return JsonResponse(result, status=200 if result.get('success') else 500)
+            
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'success': False,
+                'message': '잘못된 JSON 형식입니다.'
+            }, status=400)
+        except Exception as e:
+            logger.error(f'배치 쿼리 처리 오류: {e}')
+            return JsonResponse({
+                'success': False,
+                'message': f'서버 오류: {str(e)}'
+            }, status=500)
+
 @method_decorator(csrf_exempt, name='dispatch')
 class FirestoreSelectionView(View):
     """사용자의 최종 관광지 선택 처리"""
@@ -143,16 +279,59 @@ class FirestoreUserSelectionsView(View):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class FirestoreAllSpotsView(View):
-    """모든 관광지 데이터 조회 (관리용)"""
-    
-    def __init__(self):
-        super().__init__()
-        self.tourism_service = TourismRecommendationService()
+    """관광지 목록 페이지 조회 (관리용)"""
     
     def get(self, request):
+        """
+        문서 ID 순 키셋 페이지네이션: ?limit=50&after=<이전 응답의 next_cursor>
+        fields=title,category,firstimage2 로 필요한 필드만 조회 (id는 항상 포함)
+        """
         try:
-            result = self.tourism_service.get_all_tourism_spots()
-            return JsonResponse(result)
+            etag, not_modified = check_not_modified(request)
+            if not_modified:
+                return not_modified
+            
+            try:
+                limit = int(request.GET.get('limit', getattr(settings, 'SPOTS_PAGE_SIZE', 50)))
+            except ValueError:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'limit은 정수여야 합니다.'
+                }, status=400)
+            limit = min(max(limit, 1), getattr(settings, 'SPOTS_MAX_PAGE_SIZE', 200))
+            after = request.GET.get('after', '').strip() or None
+            
+            fields = None
+            if request.GET.get('fields'):
+                fields = [field.strip() for field in request.GET['fields'].split(',')]
+                fields = [field for field in dict.fromkeys(fields) if field and field != 'id']
+                invalid = [field for field in fields if not SPOT_FIELD_PATTERN.match(field)]
+                if invalid:
+                    return JsonResponse({
+                        'success': False,
+                        'message': f'잘못된 필드 이름입니다: {", ".join(invalid)}'
+                    }, status=400)
+                if len(fields) > MAX_SPOT_FIELDS:
+                    return JsonResponse({
+                        'success': False,
+                        'message': f'fields는 최대 {MAX_SPOT_FIELDS}개까지 지정할 수 있습니다.'
+                    }, status=400)
+            
+            result = catalog_service.get_spots_page(limit, after=after, fields=fields)
+            spots = result['spots']
+            catalog = catalog_cache.peek()
+            if fields is None and catalog is not None:
+                # 전체 필드는 카탈로그 버전별로 인코딩해 둔 문서 JSON을 이어 붙임
+                spots = SpotRepresentations.for_catalog(catalog).details_json(spots)
+            return with_cache_headers(spliced_json_response({
+                'success': True,
+                'spots': spots,
+                'total_count': result['total_count'],
+                'count': len(result['spots']),
+                'limit': limit,
+                'next_cursor': result['next_cursor'],
+                'has_more': result['next_cursor'] is not None
+            }), etag)
             
         except Exception as e:
             logger.error(f'관광지 데이터 조회 오류: {e}')
@@ -171,6 +350,10 @@ class FirestoreSearchView(View):
     
     def get(self, request):
         try:
+            _, not_modified = check_not_modified(request)
+            if not_modified:
+                return not_modified
+            
             keywords = request.GET.get('keywords', '').strip()
             if not keywords:
                 return JsonResponse({
@@ -180,9 +363,16 @@ class FirestoreSearchView(View):
             
             # 키워드를 리스트로 변환
             keyword_list = [k.strip() for k in keywords.split(',') if k.strip()]
+            fuzzy = request.GET.get('fuzzy', '').lower() in ('true', '1')
             
-            result = self.tourism_service.search_spots_by_keywords(keyword_list)
-            return JsonResponse(result)
+            # 검색 결과와 ETag가 같은 카탈로그 스냅샷에서 나오도록 한 번만 조회
+            catalog = catalog_service.get_catalog()
+            result = self.tourism_service.search_spots_by_keywords(keyword_list, fuzzy=fuzzy, catalog=catalog)
+            # 검색 실패 결과는 캐시하지 않음
+            return with_cache_headers(
+                JsonResponse(result),
+                catalog_etag(request, catalog) if result.get('success') else None
+            )
             
         except Exception as e:
             logger.error(f'키워드 검색 오류: {e}')
@@ -214,24 +404,21 @@ class FirestoreSyncView(View):
 # 함수형 뷰들
 @csrf_exempt
 def get_spot_detail(request, spot_id):
-    """특정 관광지 상세 정보"""
+    """특정 관광지 상세 정보 (카탈로그 ID 색인으로 조회)"""
     try:
-        tourism_service = TourismRecommendationService()
+        _, not_modified = check_not_modified(request)
+        if not_modified:
+            return not_modified
         
-        # Firestore에서 관광지 정보 조회
-        spots = tourism_service.get_all_tourism_spots()
-        if not spots['success']:
+        catalog = catalog_service.get_catalog()
+        if not catalog.spots:
             return JsonResponse({
                 'success': False,
                 'message': '관광지 데이터를 가져올 수 없습니다.'
             }, status=500)
         
-        # 해당 ID의 관광지 찾기
-        spot = None
-        for s in spots['spots']:
-            if str(s.get('id')) == str(spot_id) or s.get('firestore_id') == str(spot_id):
-                spot = s
-                break
+        # 문서 ID, contentid, firestore_id 모두 색인에서 조회
+        spot = catalog.get_spot(spot_id)
         
         if not spot:
             return JsonResponse({
@@ -239,13 +426,223 @@ def get_spot_detail(request, spot_id):
                 'message': '관광지를 찾을 수 없습니다.'
             }, status=404)
         
+        return with_cache_headers(spliced_json_response({
+            'success': True,
+            'spot': SpotRepresentations.for_catalog(catalog).detail_json(spot)
+        }), catalog_etag(request, catalog))
+        
+    except Exception as e:
+        logger.error(f'관광지 상세 조회 오류: {e}')
         return JsonResponse({
+            'success': False,
+            'message': f'서버 오류: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+def similar_spots(request, spot_id):
+    """비슷한 관광지 (텍스트·카테고리·거리 기반, 카탈로그 버전별 사전 계산)"""
+    try:
+        try:
+            limit = min(max(int(request.GET.get('limit', 10)), 1), SpotNeighbourIndex.DEFAULT_NEIGHBOURS)
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'limit은 정수여야 합니다.'
+            }, status=400)
+        
+        catalog = catalog_service.get_catalog()
+        # 상세 조회와 같은 ID 색인으로 해석 (문서 ID, contentid, firestore_id)
+        spot = catalog.get_spot(spot_id)
+        similar = SpotNeighbourIndex.for_catalog(catalog).similar(spot, limit) if spot else None
+        if similar is None:
+            return JsonResponse({
+                'success': False,
+                'message': '관광지를 찾을 수 없습니다.'
+            }, status=404)
+        
+        representations = SpotRepresentations.for_catalog(catalog)
+        return spliced_json_response({
             'success': True,
-            'spot': spot
+            'spot_id': str(spot_id),
+            'similar_spots': join_json(
+                extend_json(representations.summary_json(spot), {'similarity': round(score, 4)})
+                for spot, score in similar
+            ),
+            'total_count': len(similar)
         })
         
     except Exception as e:
-        logger.error(f'관광지 상세 조회 오류: {e}')
+        logger.error(f'유사 관광지 조회 오류: {e}')
+        return JsonResponse({
+            'success': False,
+            'message': f'서버 오류: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+def spot_autocomplete(request):
+    """관광지 이름 자동완성 (q=입력 접두사, 초성 입력 지원: ㅂㄱㄱㄱ → 빙계계곡)"""
+    try:
+        query = request.GET.get('q', '').strip()
+        try:
+            limit = min(max(int(request.GET.get('limit', DEFAULT_TOP_K)), 1), DEFAULT_TOP_K)
+        except ValueError:
+            limit = DEFAULT_TOP_K
+        
+        suggestions = []
+        if query:
+            catalog = catalog_service.get_catalog()
+            suggestions = SpotAutocomplete.for_catalog(catalog).suggest(query, limit)
+        
+        return JsonResponse({
+            'success': True,
+            'query': query,
+            'suggestions': suggestions,
+            'total_count': len(suggestions)
+        })
+        
+    except Exception as e:
+        logger.error(f'자동완성 오류: {e}')
+        return JsonResponse({
+            'success': False,
+            'message': f'서버 오류: {str(e)}'
+        }, status=500)
+
+def parse_facet_filters(params) -> dict:
+    """쿼리 파라미터에서 패싯 필터 추출 (쉼표 구분 또는 반복 파라미터, 같은 패싯 안에서는 OR)"""
+    filters = {}
+    for facet in FACETS:
+        values = [value.strip() for raw in params.getlist(facet) for value in raw.split(',') if value.strip()]
+        if values:
+            filters[facet] = values
+    return filters
+
+
+@csrf_exempt
+def spot_filter(request):
+    """패싯 필터 (category, contenttypeid, sigungucode, has_image, has_phone, tags, cat, lcls) + 패싯별 개수"""
+    try:
+        try:
+            limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+            offset = max(int(request.GET.get('offset', 0)), 0)
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'limit과 offset은 정수여야 합니다.'
+            }, status=400)
+        
+        filters = parse_facet_filters(request.GET)
+        catalog = catalog_service.get_catalog()
+        index = FacetIndex.for_catalog(catalog)
+        
+        bits = index.match(filters)
+        rows = index.rows(bits)
+        spots = SpotRepresentations.for_catalog(catalog).summaries_json(
+            catalog.spots[row] for row in rows[offset:offset + limit]
+        )
+        
+        return spliced_json_response({
+            'success': True,
+            'filters': filters,
+            'spots': spots,
+            'total_count': int(rows.size),
+            'offset': offset,
+            'limit': limit,
+            'facets': index.counts(filters)
+        })
+        
+    except Exception as e:
+        logger.error(f'관광지 필터 오류: {e}')
+        return JsonResponse({
+            'success': False,
+            'message': f'서버 오류: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+def spot_taxonomy(request):
+    """관광지 분류 체계 트리 (cat: cat1~3, lcls: lclsSystm1~3) 및 분류별 관광지 수"""
+    try:
+        catalog = catalog_service.get_catalog()
+        index = TaxonomyIndex.for_catalog(catalog)
+        
+        return JsonResponse({
+            'success': True,
+            'taxonomy': {system: tree.tree() for system, tree in index.systems.items()}
+        })
+        
+    except Exception as e:
+        logger.error(f'분류 체계 조회 오류: {e}')
+        return JsonResponse({
+            'success': False,
+            'message': f'서버 오류: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+def spot_clusters(request):
+    """지도용 관광지 클러스터 (bbox=최소경도,최소위도,최대경도,최대위도&zoom=줌레벨)"""
+    try:
+        try:
+            bbox = tuple(float(value) for value in request.GET.get('bbox', '').split(','))
+            zoom = int(request.GET.get('zoom', ''))
+            if len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+                raise ValueError
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'bbox(최소경도,최소위도,최대경도,최대위도)와 zoom이 필요합니다.'
+            }, status=400)
+        
+        catalog = catalog_service.get_catalog()
+        result = SpotClusterIndex.for_catalog(catalog).query(bbox, zoom)
+        
+        return JsonResponse({
+            'success': True,
+            'zoom': result['zoom'],
+            'clusters': result['clusters'],
+            'total_count': len(result['clusters']),
+            'truncated': result['truncated']
+        })
+        
+    except Exception as e:
+        logger.error(f'클러스터 조회 오류: {e}')
+        return JsonResponse({
+            'success': False,
+            'message': f'서버 오류: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+def pachinko_feed(request):
+    """파친코 게임용 가중 랜덤 관광지 (Firestore/Gemini 호출 없이 카탈로그 캐시에서 추출)"""
+    try:
+        try:
+            count = min(int(request.GET.get('count', 20)), 20)
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'count는 숫자여야 합니다.'
+            }, status=400)
+        category = request.GET.get('category') or None
+        
+        catalog = catalog_service.get_catalog()
+        feed = PachinkoFeed.for_catalog(catalog)
+        
+        if category and category not in feed.members:
+            return JsonResponse({
+                'success': False,
+                'message': f'알 수 없는 카테고리입니다: {category}',
+                'categories': feed.categories
+            }, status=400)
+        
+        spots = feed.draw(max(count, 0), category=category)
+        
+        return spliced_json_response({
+            'success': True,
+            'spots': SpotRepresentations.for_catalog(catalog).summaries_json(spots),
+            'total_count': len(spots),
+            'catalog_version': catalog.version
+        })
+        
+    except Exception as e:
+        logger.error(f'파친코 피드 오류: {e}')
         return JsonResponse({
             'success': False,
             'message': f'서버 오류: {str(e)}'
@@ -0,0 +1,43 @@
+"""
+관광지 벡터 검색 인덱스 생성
+현재 카탈로그로 해싱 TF-IDF(+SVD) 벡터를 계산하여 TOURISM_VECTOR_INDEX_PATH에 저장
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from tourism.services import FirestoreTourismService
+from tourism.vector_index import SpotVectorIndex
+
+
+class Command(BaseCommand):
+    help = '관광지 벡터 검색 인덱스를 생성합니다'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--components',
+            type=int,
+            default=getattr(settings, 'TOURISM_VECTOR_INDEX_COMPONENTS', 128),
+            help='SVD 차원 수 (0이면 차원 축소 없이 해싱 TF-IDF 그대로 저장)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=getattr(settings, 'TOURISM_VECTOR_INDEX_PATH', 'vector_index'),
+            help='인덱스 저장 디렉터리',
+        )
+    
+    def handle(self, *args, **options):
+        tourism_service = FirestoreTourismService()
+        catalog = tourism_service.get_catalog()
+        if not catalog.spots:
+            self.stdout.write(self.style.ERROR('관광지 데이터가 없습니다'))
+            return
+        
+        index = SpotVectorIndex.build(catalog.spots, options['components'], catalog.version)
+        index.save(options['output'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'벡터 인덱스 생성 완료: {len(index)}개 관광지, '
+                f'{index.vectors.shape[1]}차원, version={catalog.version} → {options["output"]}'
+            )
+        )
@@ -0,0 +1,97 @@
+"""
+자주 선택되는 관광지 조합의 여행 설명을 미리 생성하여 캐시에 저장
+user_tourism_selections의 완료된 선택 기록에서 조합 빈도를 집계
+"""
+from collections import Counter
+from django.core.management.base import BaseCommand
+from tourism.services import FirestoreTourismService
+from gemini_ai.services import GeminiAIService
+from gemini_ai.description_cache import TravelDescriptionCache, spots_version
+
+
+class Command(BaseCommand):
+    help = '자주 선택되는 관광지 조합의 여행 설명을 미리 생성합니다'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=50,
+            help='미리 생성할 조합 개수 (빈도순, 기본 50)',
+        )
+        parser.add_argument(
+            '--min-count',
+            type=int,
+            default=2,
+            help='최소 선택 횟수 (기본 2)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='설명을 생성하지 않고 대상 조합만 출력',
+        )
+    
+    def handle(self, *args, **options):
+        tourism_service = FirestoreTourismService()
+        if not tourism_service.db:
+            self.stdout.write(self.style.ERROR('Firestore 클라이언트가 초기화되지 않았습니다'))
+            return
+        
+        combinations = self.count_combinations(tourism_service)
+        targets = [
+            (spot_ids, count) for spot_ids, count in combinations.most_common(options['top'])
+            if count >= options['min_count']
+        ]
+        self.stdout.write(f'총 {len(combinations)}개 조합 중 {len(targets)}개 조합을 대상으로 합니다')
+        
+        if options['dry_run']:
+            for spot_ids, count in targets:
+                self.stdout.write(f'  {count}회: {", ".join(spot_ids)}')
+            return
+        
+        catalog = tourism_service.get_catalog()
+        description_cache = TravelDescriptionCache(tourism_service)
+        gemini_service = GeminiAIService()
+        
+        generated_count = 0
+        cached_count = 0
+        skipped_count = 0
+        
+        for spot_ids, count in targets:
+            spots = [spot for spot in (catalog.get_spot(spot_id) for spot_id in spot_ids) if spot]
+            if len(spots) != len(spot_ids):
+                # 카탈로그에서 사라진 관광지가 포함된 조합
+                skipped_count += 1
+                continue
+            
+            version = spots_version(spots)
+            if description_cache.get(spot_ids, version):
+                cached_count += 1
+                continue
+            
+            description = gemini_service.generate_tourism_description(spots)
+            if description:
+                description_cache.set(spot_ids, version, description)
+                generated_count += 1
+            else:
+                skipped_count += 1
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'여행 설명 캐시 준비 완료: 생성 {generated_count}개, '
+                f'기존 캐시 {cached_count}개, 건너뜀 {skipped_count}개'
+            )
+        )
+    
+    def count_combinations(self, tourism_service) -> Counter:
+        """완료된 선택 기록에서 관광지 조합별 선택 횟수 집계"""
+        combinations = Counter()
+        
+        selections = tourism_service.iter_user_selections(fields=['selected_spot_ids'], status='completed')
+        
+        for selection in selections:
+            spot_ids = selection.get('selected_spot_ids') or []
+            if spot_ids:
+                combinations[tuple(sorted({str(spot_id) for spot_id in spot_ids}))] += 1
+        
+        return combinations
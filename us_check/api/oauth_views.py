@@ -1,12 +1,12 @@
 import os
 import json
 import sys
-from django.http import JsonResponse
 from django.shortcuts import redirect, render
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.conf import settings
+from .renderers import JsonResponse
 
 # GoogleOAuthService import 수정
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'accounts'))
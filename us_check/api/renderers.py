@@ -0,0 +1,35 @@
+"""
+API JSON 렌더러 - tourism.json_encoding의 인코더(orjson, 없으면 표준 json) 사용
+DRF 렌더러와 JsonResponse 대체 클래스가 같은 인코더를 사용하여 응답 형식이 경로와 무관하게 동일
+"""
+import logging
+
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from tourism.json_encoding import json_dumps
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONRenderer(BaseRenderer):
+    """DRF JSON 렌더러 (REST_FRAMEWORK DEFAULT_RENDERER_CLASSES)"""
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json_dumps(data)
+
+
+class JsonResponse(HttpResponse):
+    """django.http.JsonResponse와 같은 사용법의 응답 클래스 (json_dumps로 인코딩)"""
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=json_dumps(data), **kwargs)
@@ -7,8 +7,15 @@ import uuid
 from typing import Dict, List, Optional
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.conf import settings
 from tourism.services import FirestoreTourismService
+from tourism.catalog import catalog_cache
+from tourism.ranking import LocalSpotRanker
+from tourism.itinerary import ItineraryPlanner
+from tourism.fuzzy import FuzzyTitleIndex
+from tourism.representations import SpotRepresentations
 from gemini_ai.services import GeminiAIService
+from gemini_ai.description_cache import TravelDescriptionCache
 from qr_service.services import QRCodeService
 
 logger = logging.getLogger(__name__)
@@ -20,19 +27,21 @@ class TourismRecommendationService:
         self.tourism_service = FirestoreTourismService()
         self.gemini_service = GeminiAIService()
         self.qr_service = QRCodeService()
+        self.description_cache = TravelDescriptionCache(self.tourism_service)
         
-    def process_user_query(self, user_query: str, user: User = None, session_id: str = None) -> Dict:
-        """사용자 쿼리 처리 - 메인 엔드포인트"""
+    def process_user_query(self, user_query: str, user: User = None, session_id: str = None,
+                           location: Optional[tuple] = None) -> Dict:
+        """사용자 쿼리 처리 - 메인 엔드포인트 (location: 사용자 위치 (위도, 경도), 선택)"""
         try:
             if not session_id:
                 session_id = str(uuid.uuid4())
             
             logger.info(f"Processing user query: {user_query[:100]}...")
             
-            # 1. Gemini AI로 쿼리 분석 및 관광지 추천
-            all_spots = self.tourism_service.get_all_spots()
+            # 1. Gemini AI로 쿼리 분석 및 관광지 추천 (카탈로그 버전별 컨텍스트 캐시 사용)
+            catalog = self.tourism_service.get_catalog()
             recommendation_result = self.gemini_service.recommend_tourism_spots(
-                user_query, all_spots
+                user_query, catalog.spots, catalog=catalog, location=location
             )
             
             if not recommendation_result.get('success', False):
@@ -50,6 +59,7 @@ class TourismRecommendationService:
                 'processed_query': user_query,
                 'ai_analysis': recommendation_result['analysis'],
                 'recommended_spots': recommendation_result['recommended_spots'],
+                'user_location': {'lat': location[0], 'lon': location[1]} if location else None,
                 'created_at': timezone.now().isoformat(),
                 'updated_at': timezone.now().isoformat(),
                 'status': 'pending'
@@ -82,6 +92,88 @@ class TourismRecommendationService:
                 'session_id': session_id
             }
     
+    def process_user_queries_batch(self, user_queries: List[str], user: User = None,
+                                   session_id: str = None, limit: int = None) -> Dict:
+        """여러 쿼리를 한 번에 처리 - 키오스크/오프라인 작업용 배치 엔드포인트"""
+        try:
+            max_size = getattr(settings, 'BATCH_QUERY_MAX_SIZE', 50)
+            if len(user_queries) > max_size:
+                return {
+                    'success': False,
+                    'message': f'한 번에 최대 {max_size}개의 쿼리만 처리할 수 있습니다.'
+                }
+            
+            if not session_id:
+                session_id = str(uuid.uuid4())
+            if not limit:
+                limit = getattr(settings, 'RECOMMENDATION_RESULT_SIZE', 15)
+            
+            # 1. 중복 쿼리 제거 (입력 순서 유지)
+            unique_queries = list(dict.fromkeys(user_queries))
+            logger.info(f"Processing query batch: {len(user_queries)} queries ({len(unique_queries)} unique)")
+            
+            # 2. Gemini 묶음 분석 + 로컬 랭킹 일괄 계산
+            catalog = self.tourism_service.get_catalog()
+            analysis_results = self.gemini_service.analyze_user_queries_batch(unique_queries, catalog=catalog)
+            analyses = [result.get('analysis', {}) for result in analysis_results]
+            
+            ranker = LocalSpotRanker.for_catalog(catalog)
+            representations = SpotRepresentations.for_catalog(catalog)
+            ranked_lists = ranker.rank_batch(
+                analyses, limit, quotas=getattr(settings, 'RECOMMENDATION_CATEGORY_QUOTAS', None)
+            )
+            
+            # 3. 선택 기록을 단일 Firestore 배치로 저장
+            now = timezone.now().isoformat()
+            selection_records = []
+            for query, analysis, ranked in zip(unique_queries, analyses, ranked_lists):
+                selection_records.append({
+                    'user_id': user.id if user else None,
+                    'username': user.username if user else None,
+                    'session_id': session_id,
+                    'original_query': query,
+                    'processed_query': query,
+                    'ai_analysis': analysis,
+                    'recommended_spots': [representations.summary(spot) for spot, _ in ranked],
+                    'created_at': now,
+                    'updated_at': now,
+                    'status': 'pending',
+                    'source': 'batch'
+                })
+            
+            selection_ids = self.tourism_service.create_user_selections_batch(selection_records)
+            
+            results_by_query = {}
+            for record, selection_id in zip(selection_records, selection_ids):
+                results_by_query[record['original_query']] = {
+                    'success': True,
+                    'selection_id': selection_id,
+                    'query': record['original_query'],
+                    'analysis': record['ai_analysis'],
+                    'recommended_spots': record['recommended_spots']
+                }
+            
+            # 4. 요청 순서대로 응답 구성 (중복 쿼리는 같은 결과 공유)
+            return {
+                'success': True,
+                'session_id': session_id,
+                'results': [results_by_query[query] for query in user_queries],
+                'total_count': len(user_queries),
+                'unique_count': len(unique_queries),
+                'user_info': {
+                    'user_id': user.id if user else None,
+                    'username': user.username if user else None
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing query batch: {e}")
+            return {
+                'success': False,
+                'message': f'배치 쿼리 처리 중 오류가 발생했습니다: {str(e)}',
+                'session_id': session_id
+            }
+    
     def finalize_user_selection(self, selection_id: str, selected_spot_ids: List[str], 
                               user: User = None) -> Dict:
         """사용자의 최종 관광지 선택 처리 - Firestore 기반"""
@@ -91,16 +183,19 @@ class TourismRecommendationService:
             if not selection_record:
                 return {'success': False, 'message': 'Selection record not found'}
             
-            # 2. 선택된 관광지 정보 조회
-            selected_spots = []
-            for spot_id in selected_spot_ids:
-                spot = self.tourism_service.get_spot_by_id(spot_id)
-                if spot:
-                    selected_spots.append(spot)
+            # 2. 선택된 관광지 정보 조회 (카탈로그 캐시 또는 Firestore 일괄 조회 한 번)
+            spots_result = self.tourism_service.get_spots_by_ids(selected_spot_ids)
+            selected_spots = spots_result['spots']
             
             if not selected_spots:
                 return {'success': False, 'message': 'No valid spots selected'}
             
+            # 방문 순서 계산 - 카탈로그 캐시가 유효하면 거리 행렬 캐시 사용, 아니면 선택 관광지끼리만 계산
+            # (카탈로그 전체를 새로 읽지 않음)
+            catalog = catalog_cache.peek()
+            planner = ItineraryPlanner.for_catalog(catalog) if catalog is not None else ItineraryPlanner(selected_spots)
+            itinerary = planner.plan(selected_spots)
+            
             # 3. QR 코드 생성
             qr_data = {
                 'selection_id': selection_id,
@@ -122,14 +217,18 @@ class TourismRecommendationService:
                 'selected_spot_ids': selected_spot_ids,
                 'qr_code_url': qr_result.get('qr_url', '') if qr_result.get('success') else '',
                 'qr_access_url': qr_result.get('access_url', '') if qr_result.get('success') else '',
+                'itinerary': itinerary,
                 'updated_at': timezone.now().isoformat(),
                 'status': 'completed'
             }
             
             self.tourism_service.update_user_selection(selection_id, update_data)
             
-            # 5. AI 기반 여행 설명 생성
-            travel_description = self.gemini_service.generate_tourism_description(selected_spots)
+            # 5. AI 기반 여행 설명 생성 (같은 관광지 조합은 캐시 재사용)
+            travel_description = self.description_cache.get_or_generate(
+                selected_spots,
+                self.gemini_service.generate_tourism_description
+            )
             
             # 6. 응답 데이터 구성
             response_data = {
@@ -139,6 +238,8 @@ class TourismRecommendationService:
                 'qr_code_url': qr_result.get('qr_url', '') if qr_result.get('success') else '',
                 'qr_access_url': qr_result.get('access_url', '') if qr_result.get('success') else '',
                 'travel_description': travel_description,
+                'itinerary': itinerary,
+                'missing_spot_ids': spots_result['missing_ids'],
                 'session_id': selection_record.get('session_id', ''),
                 'created_at': selection_record.get('created_at', ''),
                 'updated_at': update_data['updated_at']
@@ -225,10 +326,24 @@ class TourismRecommendationService:
                 'message': str(e)
             }
 
-    def search_spots_by_keywords(self, keywords: List[str]) -> Dict:
-        """키워드로 관광지 검색 - Firestore 기반"""
+    def search_spots_by_keywords(self, keywords: List[str], fuzzy: bool = False, catalog=None) -> Dict:
+        """
+        키워드로 관광지 검색 - 카탈로그 스냅샷 기반 (fuzzy: 오타를 허용한 이름 검색 결과도 포함)
+        catalog: 검색할 스냅샷 (응답 ETag와 같은 버전을 쓰도록 뷰에서 전달, 없으면 캐시에서 조회)
+        """
         try:
-            spots = self.tourism_service.search_spots_by_keywords(keywords)
+            if catalog is None:
+                catalog = self.tourism_service.get_catalog()
+            spots = self.tourism_service.search_spots_by_keywords(keywords, spots=catalog.spots)
+            
+            if fuzzy:
+                found_ids = {str(spot.get('id')) for spot in spots}
+                index = FuzzyTitleIndex.for_catalog(catalog)
+                for keyword in keywords:
+                    for spot, distance in index.search(keyword):
+                        if str(spot.get('id')) not in found_ids:
+                            found_ids.add(str(spot.get('id')))
+                            spots.append(dict(spot, fuzzy_distance=distance))
             
             return {
                 'success': True,
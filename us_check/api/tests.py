@@ -1,3 +1,98 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import RequestFactory, SimpleTestCase
+
+from tourism.catalog import CatalogCache
+
+from . import firestore_views
+from .firestore_views import catalog_etag, check_not_modified
+
+SPOTS = [
+    {'id': '2757700', 'contentid': '2757700', 'title': '빙계계곡', 'category': '관광지'},
+    {'id': '126453', 'contentid': '126453', 'title': '고운사(의성)', 'category': '관광지'},
+]
+
+
+class CheckNotModifiedTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        # 전역 카탈로그 캐시 대신 테스트 전용 캐시 사용 (Firestore 조회 없음)
+        self.cache = CatalogCache(ttl=300)
+        for target in ('api.firestore_views.catalog_cache', 'tourism.services.catalog_cache'):
+            patcher = mock.patch(target, self.cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def load_catalog(self, spots=SPOTS):
+        return self.cache.get(lambda: [dict(spot) for spot in spots])
+
+    def get(self, path, data=None, if_none_match=None):
+        headers = {'HTTP_IF_NONE_MATCH': if_none_match} if if_none_match is not None else {}
+        return self.factory.get(path, data or {}, **headers)
+
+    def test_without_cached_catalog(self):
+        self.assertEqual(check_not_modified(self.get('/api/spots/', if_none_match='*')), (None, None))
+
+    def test_matching_etag_returns_304(self):
+        catalog = self.load_catalog()
+        etag = catalog_etag(self.get('/api/spots/', {'limit': 2}), catalog)
+
+        for if_none_match in (etag, f'W/{etag}', f'"other", {etag}'):
+            with self.subTest(if_none_match=if_none_match):
+                result_etag, response = check_not_modified(self.get('/api/spots/', {'limit': 2}, if_none_match))
+                self.assertEqual(result_etag, etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertIn('max-age', response['Cache-Control'])
+
+    def test_other_etags_do_not_match(self):
+        catalog = self.load_catalog()
+        etag = catalog_etag(self.get('/api/spots/', {'limit': 2}), catalog)
+
+        for request in (
+            self.get('/api/spots/', {'limit': 3}, etag),
+            self.get('/api/search/', {'limit': 2}, etag),
+            self.get('/api/spots/', {'limit': 2}, '"stale"'),
+            self.get('/api/spots/', {'limit': 2}),
+        ):
+            with self.subTest(path=request.get_full_path()):
+                self.assertIsNone(check_not_modified(request)[1])
+
+    def test_etag_changes_with_catalog_version(self):
+        request = self.get('/api/spots/')
+        old_etag = catalog_etag(request, self.load_catalog())
+        self.cache.invalidate()
+        new_etag = catalog_etag(request, self.load_catalog(SPOTS + [{'id': '1', 'title': '신규'}]))
+
+        self.assertNotEqual(old_etag, new_etag)
+        self.assertIsNone(check_not_modified(self.get('/api/spots/', if_none_match=old_etag))[1])
+
+    def test_wildcard_does_not_short_circuit(self):
+        self.load_catalog()
+
+        self.assertIsNone(check_not_modified(self.get('/api/spots/', if_none_match='*'))[1])
+
+    def test_wildcard_for_missing_spot_returns_404(self):
+        self.load_catalog()
+
+        response = firestore_views.get_spot_detail(self.get('/api/spots/nope/', if_none_match='*'), 'nope')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_wildcard_for_invalid_search_returns_400(self):
+        self.load_catalog()
+
+        response = firestore_views.FirestoreSearchView.as_view()(self.get('/api/search/', if_none_match='*'))
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_spot_detail_revalidation(self):
+        self.load_catalog()
+        response = firestore_views.get_spot_detail(self.get('/api/spots/2757700/'), '2757700')
+        self.assertEqual(response.status_code, 200)
+
+        revalidated = firestore_views.get_spot_detail(
+            self.get('/api/spots/2757700/', if_none_match=response['ETag']), '2757700'
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
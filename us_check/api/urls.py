@@ -6,13 +6,22 @@ app_name = 'api'
 urlpatterns = [
     # 메인 API 엔드포인트 (Firestore 기반)
     path('query/', firestore_views.FirestoreQueryView.as_view(), name='firestore_query'),
+    path('query/batch/', firestore_views.FirestoreBatchQueryView.as_view(), name='firestore_batch_query'),
     path('selection/', firestore_views.FirestoreSelectionView.as_view(), name='firestore_selection'),
     path('selections/', firestore_views.FirestoreUserSelectionsView.as_view(), name='firestore_user_selections'),
     
     # 데이터 조회 엔드포인트 (Firestore 기반)
     path('spots/', firestore_views.FirestoreAllSpotsView.as_view(), name='firestore_all_spots'),
     path('search/', firestore_views.FirestoreSearchView.as_view(), name='firestore_search'),
+    path('spots/clusters/', firestore_views.spot_clusters, name='spot_clusters'),
+    path('spots/autocomplete/', firestore_views.spot_autocomplete, name='spot_autocomplete'),
+    path('spots/filter/', firestore_views.spot_filter, name='spot_filter'),
+    path('spots/taxonomy/', firestore_views.spot_taxonomy, name='spot_taxonomy'),
     path('spots/<str:spot_id>/', firestore_views.get_spot_detail, name='get_spot_detail'),
+    path('spots/<str:spot_id>/similar/', firestore_views.similar_spots, name='similar_spots'),
+    
+    # 파친코 게임 피드
+    path('pachinko/feed/', firestore_views.pachinko_feed, name='pachinko_feed'),
     
     # QR 코드 및 접근
     path('qr/<str:qr_id>/', firestore_views.qr_access, name='qr_access'),
@@ -10,6 +10,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'us_check.settings')
 django.setup()
 
 from django.conf import settings
+from tourism.services import FirestoreTourismService
 
 def check_firestore_data():
     try:
@@ -27,28 +28,26 @@ def check_firestore_data():
         print(f"📋 프로젝트: {settings.FIRESTORE_PROJECT_ID}")
         print(f"📋 데이터베이스: {settings.FIRESTORE_DATABASE_ID}")
         
-        # 문서 개수 확인
-        docs = db.collection(collection_name).stream()
-        doc_list = list(docs)
-        total_count = len(doc_list)
+        # 문서를 페이지 단위로 스트리밍하며 개수와 contenttypeid별 분포 집계
+        tourism_service = FirestoreTourismService()
+        total_count = 0
+        first_doc = None
+        content_types = {}
+        for data in tourism_service.iter_collection(collection_name, fields=['title', 'addr1', 'contenttypeid']):
+            if first_doc is None:
+                first_doc = data
+            total_count += 1
+            content_type = data.get('contenttypeid', 'Unknown')
+            content_types[content_type] = content_types.get(content_type, 0) + 1
         
         print(f"📊 총 문서 개수: {total_count}개")
         
         if total_count > 0:
             print(f"📝 첫 번째 문서 샘플:")
-            first_doc = doc_list[0]
-            data = first_doc.to_dict()
-            print(f"   - ID: {first_doc.id}")
-            print(f"   - 이름: {data.get('title', 'N/A')}")
-            print(f"   - 주소: {data.get('addr1', 'N/A')}")
-            print(f"   - 카테고리: {data.get('contenttypeid', 'N/A')}")
-            
-            # contenttypeid별 분포 확인
-            content_types = {}
-            for doc in doc_list:
-                data = doc.to_dict()
-                content_type = data.get('contenttypeid', 'Unknown')
-                content_types[content_type] = content_types.get(content_type, 0) + 1
+            print(f"   - ID: {first_doc['id']}")
+            print(f"   - 이름: {first_doc.get('title', 'N/A')}")
+            print(f"   - 주소: {first_doc.get('addr1', 'N/A')}")
+            print(f"   - 카테고리: {first_doc.get('contenttypeid', 'N/A')}")
             
             print(f"📈 contenttypeid별 분포:")
             for content_type, count in sorted(content_types.items()):
@@ -0,0 +1,198 @@
+"""
+Gemini 컨텍스트 캐시 - 시스템 지시문과 카탈로그 프리픽스 재사용
+카탈로그 버전마다 cached content 핸들을 하나 만들어 분석/재순위 호출에서 공유
+"""
+import datetime
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def build_compact_catalog(spots: List[Dict], overview_chars: int = 80) -> str:
+    """캐시에 넣을 압축 카탈로그 텍스트 생성 (한 줄에 관광지 하나)"""
+    lines = []
+    for spot in spots:
+        spot_id = spot.get('id', spot.get('contentid', ''))
+        overview = ' '.join(str(spot.get('overview', '')).split())[:overview_chars]
+        lines.append(f"{spot_id}|{spot.get('title', '')}|{spot.get('category', '')}|{overview}")
+    return '\n'.join(lines)
+
+
+class GenAICacheBackend:
+    """google.generativeai caching API를 사용하는 기본 백엔드"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def create(self, system_instruction: str, contents: List[str], ttl: int, display_name: str) -> Any:
+        from google.generativeai import caching
+
+        return caching.CachedContent.create(
+            model=f'models/{self.model_name}',
+            display_name=display_name,
+            system_instruction=system_instruction,
+            contents=contents,
+            ttl=datetime.timedelta(seconds=ttl),
+        )
+
+    def model_for(self, handle: Any) -> Any:
+        import google.generativeai as genai
+
+        return genai.GenerativeModel.from_cached_content(cached_content=handle)
+
+    def delete(self, handle: Any):
+        handle.delete()
+
+
+class _PrefixedModel:
+    """캐시된 프리픽스를 프롬프트 앞에 붙여 호출하는 로컬 모델 래퍼"""
+
+    def __init__(self, model: Any, prefix: str):
+        self.model = model
+        self.prefix = prefix
+
+    def generate_content(self, prompt: str, **kwargs):
+        return self.model.generate_content(f'{self.prefix}\n\n{prompt}', **kwargs)
+
+
+class LocalCacheBackend:
+    """
+    로컬 대체 백엔드 - 실제 cached content API 없이 동일한 흐름을 재현
+    개발/테스트 환경에서 GeminiContextCache에 주입하여 사용
+    """
+
+    def __init__(self, model: Any = None):
+        self.model = model
+        self.handles: Dict[str, Dict] = {}
+        self._counter = 0
+
+    def create(self, system_instruction: str, contents: List[str], ttl: int, display_name: str) -> Dict:
+        self._counter += 1
+        handle = {
+            'name': f'local-cache/{self._counter}',
+            'display_name': display_name,
+            'system_instruction': system_instruction,
+            'contents': list(contents),
+            'ttl': ttl,
+        }
+        self.handles[handle['name']] = handle
+        return handle
+
+    def model_for(self, handle: Dict) -> Any:
+        return _PrefixedModel(self.model, '\n\n'.join(handle['contents']))
+
+    def delete(self, handle: Dict):
+        self.handles.pop(handle['name'], None)
+
+
+class GeminiContextCache:
+    """
+    카탈로그 버전별 Gemini cached content 핸들 관리
+    교체된 핸들은 다른 스레드가 아직 생성 호출에 쓰고 있을 수 있으므로 retire_grace초 뒤에 삭제
+    (그 전에 프로세스가 끝나면 서버 측 TTL로 만료)
+    """
+
+    def __init__(self, backend: Any, system_instruction: str, static_contents: List[str] = None,
+                 ttl: int = 3600, retire_grace: int = 300):
+        self.backend = backend
+        self.system_instruction = system_instruction
+        self.static_contents = static_contents or []
+        self.ttl = ttl
+        self.retire_grace = retire_grace
+
+        self._version: Optional[str] = None
+        self._handle: Any = None
+        self._model: Any = None
+        self._created_at: Optional[datetime.datetime] = None
+        self._failed_version: Optional[str] = None
+        self._retired: List[Tuple[Any, datetime.datetime]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    def get_model(self, catalog_version: str, spots: List[Dict]) -> Optional[Any]:
+        """카탈로그 버전에 맞는 캐시 모델 반환, 사용할 수 없으면 None"""
+        if not catalog_version:
+            return None
+
+        if self._is_fresh(catalog_version):
+            return self._model
+
+        with self._lock:
+            if self._is_fresh(catalog_version):
+                return self._model
+            if self._failed_version == catalog_version:
+                # 같은 버전으로 캐시 생성을 반복 시도하지 않음
+                return None
+            return self._refresh(catalog_version, spots)
+
+    def invalidate(self):
+        """현재 핸들 폐기 (삭제는 유예 시간 뒤)"""
+        with self._lock:
+            self._retire_handle()
+            self._purge_retired()
+            self._failed_version = None
+
+    def _now(self) -> datetime.datetime:
+        return datetime.datetime.now()
+
+    def _is_fresh(self, catalog_version: str) -> bool:
+        created_at = self._created_at
+        if self._model is None or self._version != catalog_version or created_at is None:
+            return False
+        # 서버 측 TTL 만료 직전에는 새로 생성
+        age = (self._now() - created_at).total_seconds()
+        return age < self.ttl * 0.9
+
+    def _refresh(self, catalog_version: str, spots: List[Dict]) -> Optional[Any]:
+        self._retire_handle()
+        self._purge_retired()
+        try:
+            contents = self.static_contents + [
+                f'[의성군 관광지 카탈로그 version={catalog_version}]\n'
+                f'형식: ID|이름|카테고리|개요\n'
+                f'{build_compact_catalog(spots)}'
+            ]
+            handle = self.backend.create(
+                system_instruction=self.system_instruction,
+                contents=contents,
+                ttl=self.ttl,
+                display_name=f'us-check-catalog-{catalog_version}',
+            )
+            self._handle = handle
+            self._model = self.backend.model_for(handle)
+            self._version = catalog_version
+            self._created_at = self._now()
+            self._failed_version = None
+            logger.info(f'Gemini 컨텍스트 캐시 생성: version={catalog_version}, {len(spots)}개 관광지')
+            return self._model
+        except Exception as e:
+            logger.warning(f'Gemini 컨텍스트 캐시 생성 실패 (일반 호출 사용): {e}')
+            self._failed_version = catalog_version
+            return None
+
+    def _retire_handle(self):
+        if self._handle is not None:
+            self._retired.append((self._handle, self._now()))
+        self._handle = None
+        self._model = None
+        self._version = None
+        self._created_at = None
+
+    def _purge_retired(self):
+        """유예 시간이 지난 교체 핸들 삭제"""
+        now = self._now()
+        pending = []
+        for handle, retired_at in self._retired:
+            if (now - retired_at).total_seconds() < self.retire_grace:
+                pending.append((handle, retired_at))
+                continue
+            try:
+                self.backend.delete(handle)
+            except Exception as e:
+                logger.warning(f'Gemini 컨텍스트 캐시 삭제 실패: {e}')
+        self._retired = pending
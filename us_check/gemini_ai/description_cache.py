@@ -0,0 +1,83 @@
+"""
+여행 설명 캐시 - 같은 관광지 조합에 대한 Gemini 설명 생성 재사용
+정렬된 관광지 ID 집합 + 선택 관광지 내용 버전을 키로 Django 캐시(1차)와 Firestore(2차)에 저장
+"""
+import hashlib
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from tourism.catalog import CatalogSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def spots_version(spots: List[Dict]) -> str:
+    """
+    선택 관광지 내용 버전 - 설명은 선택된 관광지에만 의존하므로 카탈로그 전체가 아닌 해당 문서 내용으로 계산
+    (카탈로그 캐시든 Firestore 일괄 조회든 같은 문서면 같은 버전)
+    """
+    return CatalogSnapshot.compute_version(spots)
+
+
+def description_cache_key(spot_ids: Iterable, version: str) -> str:
+    """관광지 ID 집합(순서 무관)과 내용 버전으로 캐시 키 생성"""
+    normalized = ','.join(sorted({str(spot_id) for spot_id in spot_ids}))
+    return hashlib.sha1(f'{version}|{normalized}'.encode('utf-8')).hexdigest()
+
+
+class TravelDescriptionCache:
+    """관광지 조합별 여행 설명 캐시"""
+
+    CACHE_PREFIX = 'travel_description:'
+
+    def __init__(self, tourism_service, ttl: int = None):
+        self.tourism_service = tourism_service
+        self.ttl = ttl if ttl is not None else getattr(settings, 'TRAVEL_DESCRIPTION_CACHE_TTL', 60 * 60 * 24 * 7)
+
+    def get(self, spot_ids: Iterable, version: str) -> Optional[str]:
+        """캐시된 설명 조회 (Django 캐시 → Firestore 순)"""
+        key = description_cache_key(spot_ids, version)
+
+        description = cache.get(self.CACHE_PREFIX + key)
+        if description:
+            return description
+
+        record = self.tourism_service.get_travel_description(key)
+        if record and record.get('expires_at', 0) > time.time() and record.get('description'):
+            remaining = int(record['expires_at'] - time.time())
+            cache.set(self.CACHE_PREFIX + key, record['description'], remaining)
+            return record['description']
+        return None
+
+    def set(self, spot_ids: Iterable, version: str, description: str):
+        """설명을 두 계층 캐시에 모두 저장"""
+        if not description:
+            return
+
+        spot_ids = sorted({str(spot_id) for spot_id in spot_ids})
+        key = description_cache_key(spot_ids, version)
+        cache.set(self.CACHE_PREFIX + key, description, self.ttl)
+        self.tourism_service.save_travel_description(key, {
+            'description': description,
+            'spot_ids': spot_ids,
+            'version': version,
+            'expires_at': time.time() + self.ttl
+        })
+
+    def get_or_generate(self, spots: List[Dict], generator: Callable[[List[Dict]], str]) -> str:
+        """캐시에 없을 때만 generator(Gemini)로 설명 생성"""
+        spot_ids = [spot.get('id', spot.get('contentid', '')) for spot in spots]
+        version = spots_version(spots)
+
+        description = self.get(spot_ids, version)
+        if description:
+            logger.info(f'여행 설명 캐시 적중: {len(spot_ids)}개 관광지')
+            return description
+
+        description = generator(spots)
+        self.set(spot_ids, version, description)
+        return description
@@ -3,48 +3,120 @@ Gemini AI 서비스 - 자연어 처리 및 관광지 추천
 """
 import logging
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from django.conf import settings
 import google.generativeai as genai
+from tourism.ranking import LocalSpotRanker, select_top_k_with_quotas
+from tourism.similarity import diversify
+from tourism.representations import SpotRepresentations, clean_spot_data
+from tourism.vector_index import load_vector_index
+from .context_cache import GeminiContextCache, GenAICacheBackend
 # Django 모델 제거 - Firestore 기반으로 전환
 # from tourism.models import TourismSpot
 # from tourism.services import TourismDataService
 
 logger = logging.getLogger(__name__)
 
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
+
+# System instruction 설정
+SYSTEM_INSTRUCTION = """
+당신은 경상북도 의성군 관광지 추천 전문 AI입니다.
+
+주요 역할:
+1. 사용자의 자연어 쿼리를 분석하여 적절한 관광지를 추천
+2. 의성군의 특색과 문화를 반영한 추천 제공
+3. 정확하고 유용한 관광 정보 제공
+
+의성군 주요 특징:
+- 마늘과 양파의 고장으로 유명
+- 조문국 유적지와 역사 문화재 보유
+- 빙계계곡, 사촌역 은행나무 등 자연 관광지
+- 전통과 현대가 조화된 관광 도시
+
+응답 원칙:
+- 항상 JSON 형식으로 구조화된 데이터 제공
+- JSON 입력의 key 순서는 절대 바꾸지 않습니다
+- 음식점, 숙박, 관광지는 각각 최소 5개 이상 추천
+
+"""
+
+# 쿼리 분석 지침 (프롬프트와 컨텍스트 캐시에서 공통 사용)
+ANALYSIS_GUIDE = """
+다음 정보를 추출하여 JSON 형태로 반환해주세요:
+{
+    "keywords": ["추출된 키워드들"],
+    "categories": ["관광지 카테고리들"],
+    "preferences": ["사용자 선호사항들"],
+    "intent": "사용자 의도",
+    "processed_query": "정제된 검색 쿼리",
+    "confidence": 0.0-1.0
+}
+
+가능한 카테고리:
+- 문화재/유적지
+- 자연관광지
+- 체험관광지
+- 축제/이벤트
+- 음식/맛집
+- 숙박시설
+- 레저/스포츠
+
+의성군의 특색:
+- 마늘과 양파의 고장
+- 조문국 유적지
+- 빙계계곡
+- 사촌역 은행나무
+- 의성 조문국사적지
+"""
+
+# 컨텍스트 캐시에 함께 저장되는 요청 유형별 지침
+CACHED_REQUEST_GUIDE = f"""
+이 대화에는 두 종류의 요청이 옵니다.
+
+[분석 요청] 사용자 쿼리를 분석합니다.
+{ANALYSIS_GUIDE}
+
+[순위 요청] 아래 카탈로그의 관광지 ID 중에서 사용자 쿼리에 가장 적합한 순서로 지정된 개수를 선택하고,
+선택된 관광지 ID만 쉼표로 구분하여 반환합니다 (예: 2604657,126512,2790011).
+"""
+
+_shared_context_cache = None
+_shared_context_cache_lock = threading.Lock()
+
+
+def get_shared_context_cache() -> Optional[GeminiContextCache]:
+    """프로세스 전역 Gemini 컨텍스트 캐시 (설정으로 비활성화 가능)"""
+    global _shared_context_cache
+
+    if not getattr(settings, 'GEMINI_CONTEXT_CACHE_ENABLED', True):
+        return None
+
+    with _shared_context_cache_lock:
+        if _shared_context_cache is None:
+            _shared_context_cache = GeminiContextCache(
+                backend=GenAICacheBackend(GEMINI_MODEL_NAME),
+                system_instruction=SYSTEM_INSTRUCTION,
+                static_contents=[CACHED_REQUEST_GUIDE],
+                ttl=getattr(settings, 'GEMINI_CONTEXT_CACHE_TTL', 3600),
+                retire_grace=getattr(settings, 'GEMINI_CONTEXT_CACHE_RETIRE_GRACE', 300),
+            )
+        return _shared_context_cache
+
+
 class GeminiAIService:
     """Gemini AI를 이용한 자연어 처리 서비스"""
     
-    def __init__(self):
+    def __init__(self, context_cache: Optional[GeminiContextCache] = None):
         try:
             if settings.GEMINI_API_KEY:
                 genai.configure(api_key=settings.GEMINI_API_KEY)
                 
-                # System instruction 설정
-                system_instruction = """
-                당신은 경상북도 의성군 관광지 추천 전문 AI입니다.
-                
-                주요 역할:
-                1. 사용자의 자연어 쿼리를 분석하여 적절한 관광지를 추천
-                2. 의성군의 특색과 문화를 반영한 추천 제공
-                3. 정확하고 유용한 관광 정보 제공
-                
-                의성군 주요 특징:
-                - 마늘과 양파의 고장으로 유명
-                - 조문국 유적지와 역사 문화재 보유
-                - 빙계계곡, 사촌역 은행나무 등 자연 관광지
-                - 전통과 현대가 조화된 관광 도시
-                
-                응답 원칙:
-                - 항상 JSON 형식으로 구조화된 데이터 제공
-                - JSON 입력의 key 순서는 절대 바꾸지 않습니다
-                - 음식점, 숙박, 관광지는 각각 최소 5개 이상 추천
-
-                """
-                
                 self.model = genai.GenerativeModel(
-                    'gemini-2.5-flash',
-                    system_instruction=system_instruction
+                    GEMINI_MODEL_NAME,
+                    system_instruction=SYSTEM_INSTRUCTION
                 )
                 logger.info("Gemini AI initialized successfully with gemini-2.5-flash and system instruction")
             else:
@@ -54,10 +126,22 @@ class GeminiAIService:
             logger.error(f"Failed to initialize Gemini AI: {e}")
             self.model = None
         
+        # 카탈로그 버전별 컨텍스트 캐시 (로컬 대체 백엔드 주입 가능)
+        if context_cache is not None:
+            self.context_cache = context_cache
+        else:
+            self.context_cache = get_shared_context_cache() if self.model else None
+        
         # Django 모델 제거 - Firestore 직접 사용
         # self.tourism_service = TourismDataService()
     
-    def analyze_user_query(self, user_query: str) -> Dict:
+    def _get_cached_model(self, catalog) -> Optional[object]:
+        """카탈로그 스냅샷에 대응하는 컨텍스트 캐시 모델 조회"""
+        if not self.context_cache or catalog is None:
+            return None
+        return self.context_cache.get_model(catalog.version, catalog.spots)
+    
+    def analyze_user_query(self, user_query: str, catalog=None) -> Dict:
         """사용자 쿼리를 분석하여 관광지 검색 조건 추출"""
         try:
             # Gemini AI 상태 상세 로깅
@@ -72,12 +156,18 @@ class GeminiAIService:
             
             logger.info("✅ Gemini AI 사용 가능 - 실제 AI 분석 시작")
             
-            # 의성군 관광지 정보를 기반으로 한 프롬프트 생성
-            prompt = self._create_analysis_prompt(user_query)
-            logger.info(f"Generated prompt length: {len(prompt)}")
+            # 컨텍스트 캐시가 있으면 쿼리만 전송, 없으면 전체 프롬프트 생성
+            cached_model = self._get_cached_model(catalog)
+            if cached_model:
+                model = cached_model
+                prompt = f'[분석 요청]\n사용자 쿼리: "{user_query}"'
+            else:
+                model = self.model
+                prompt = self._create_analysis_prompt(user_query)
+            logger.info(f"Generated prompt length: {len(prompt)} (cached context: {cached_model is not None})")
             
             logger.info("🤖 Gemini AI 호출 중...")
-            response = self.model.generate_content(prompt)
+            response = model.generate_content(prompt)
             logger.info(f"✅ Gemini AI 응답 받음: {response.text[:100]}...")
             
             # 응답 파싱
@@ -161,6 +251,92 @@ class GeminiAIService:
             'gemini_used': False  # Gemini가 사용되지 않았음을 표시
         }
     
+    def analyze_user_queries_batch(self, user_queries: List[str], catalog=None) -> List[Dict]:
+        """여러 쿼리를 묶어서 분석 (Gemini 호출당 여러 쿼리), 입력 순서대로 결과 반환"""
+        if not self.model:
+            return [self._fallback_analysis(query) for query in user_queries]
+        
+        pack_size = max(1, getattr(settings, 'GEMINI_BATCH_ANALYSIS_SIZE', 10))
+        results = []
+        for start in range(0, len(user_queries), pack_size):
+            results.extend(self._analyze_query_pack(user_queries[start:start + pack_size], catalog))
+        return results
+    
+    def _analyze_query_pack(self, user_queries: List[str], catalog=None) -> List[Dict]:
+        """쿼리 묶음 하나를 단일 Gemini 호출로 분석"""
+        if len(user_queries) == 1:
+            return [self.analyze_user_query(user_queries[0], catalog=catalog)]
+        
+        try:
+            query_lines = '\n'.join(
+                f'{i}: {json.dumps(query, ensure_ascii=False)}' for i, query in enumerate(user_queries)
+            )
+            cached_model = self._get_cached_model(catalog)
+            if cached_model:
+                model = cached_model
+                prompt = f"""[분석 요청]
+여러 사용자 쿼리를 각각 분석하여 JSON 배열로 반환해주세요.
+배열의 각 항목에는 쿼리 번호 "index"를 포함해주세요.
+
+{query_lines}"""
+            else:
+                model = self.model
+                prompt = f"""
+        의성군 관광지 추천 시스템입니다. 여러 사용자의 자연어 쿼리를 각각 분석해주세요.
+
+        사용자 쿼리 목록:
+        {query_lines}
+        {ANALYSIS_GUIDE}
+        각 쿼리의 분석 결과를 위 형식의 JSON 객체로 만들고 쿼리 번호 "index"를 포함하여,
+        전체를 하나의 JSON 배열로 반환해주세요.
+        """
+            
+            logger.info(f"🤖 Gemini AI 묶음 분석 호출: {len(user_queries)}개 쿼리")
+            response = model.generate_content(prompt)
+            parsed = self._parse_batch_analysis_response(response.text, len(user_queries))
+        except Exception as e:
+            logger.error(f"❌ Error analyzing query batch with Gemini: {e}")
+            parsed = [None] * len(user_queries)
+        
+        results = []
+        for query, analysis in zip(user_queries, parsed):
+            if analysis is None:
+                # 해당 쿼리만 폴백 분석
+                results.append(self._fallback_analysis(query))
+                continue
+            results.append({
+                'success': True,
+                'original_query': query,
+                'analysis': analysis,
+                'processed_query': analysis.get('processed_query', query),
+                'gemini_used': True
+            })
+        return results
+    
+    def _parse_batch_analysis_response(self, response_text: str, expected: int) -> List[Optional[Dict]]:
+        """묶음 분석 응답(JSON 배열)을 쿼리 순서대로 정렬, 누락된 항목은 None"""
+        parsed: List[Optional[Dict]] = [None] * expected
+        try:
+            start_idx = response_text.find('[')
+            end_idx = response_text.rfind(']') + 1
+            if start_idx == -1 or end_idx == 0:
+                raise ValueError('JSON array not found')
+            items = json.loads(response_text[start_idx:end_idx])
+        except (ValueError, json.JSONDecodeError):
+            logger.warning(f"Failed to parse batch analysis response: {response_text[:200]}")
+            return parsed
+        
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.pop('index', position))
+            except (TypeError, ValueError):
+                index = position
+            if 0 <= index < expected and parsed[index] is None:
+                parsed[index] = item
+        return parsed
+    
     def recommend_tourism_spots(self, user_query: str, max_results: int = 30) -> Dict:
         """사용자 쿼리를 기반으로 관광지 추천"""
         try:
@@ -219,32 +395,7 @@ class GeminiAIService:
         의성군 관광지 추천 시스템입니다. 사용자의 자연어 쿼리를 분석해주세요.
 
         사용자 쿼리: "{user_query}"
-
-        다음 정보를 추출하여 JSON 형태로 반환해주세요:
-        {{
-            "keywords": ["추출된 키워드들"],
-            "categories": ["관광지 카테고리들"],
-            "preferences": ["사용자 선호사항들"],
-            "intent": "사용자 의도",
-            "processed_query": "정제된 검색 쿼리",
-            "confidence": 0.0-1.0
-        }}
-
-        가능한 카테고리:
-        - 문화재/유적지
-        - 자연관광지
-        - 체험관광지
-        - 축제/이벤트
-        - 음식/맛집
-        - 숙박시설
-        - 레저/스포츠
-
-        의성군의 특색:
-        - 마늘과 양파의 고장
-        - 조문국 유적지
-        - 빙계계곡
-        - 사촌역 은행나무
-        - 의성 조문국사적지
+        {ANALYSIS_GUIDE}
         """
     
     def _parse_analysis_response(self, response_text: str) -> Dict:
@@ -279,43 +430,178 @@ class GeminiAIService:
                 'confidence': 0.3
             }
     
-    def _rank_spots_with_ai(self, user_query: str, spots: List[Dict], max_results: int) -> List[Dict]:
+    def _rank_spots_with_ai(self, user_query: str, spots: List[Dict], max_results: int,
+                            catalog=None, analysis: Optional[Dict] = None) -> List[Dict]:
         """AI를 이용하여 관광지 순위 매기기"""
         try:
             if not self.model:
                 return spots[:max_results]
             
-            # 관광지 정보를 텍스트로 변환
-            spots_info = []
-            for i, spot in enumerate(spots):
-                spots_info.append(f"{i}: {spot.get('title', '')} - {spot.get('overview', '')} ({spot.get('category', '')})")
-            
-            prompt = f"""
-            사용자 쿼리: "{user_query}"
-            
-            다음 관광지들 중에서 사용자 쿼리에 가장 적합한 순서로 {max_results}개를 선택해주세요:
-            
-            {chr(10).join(spots_info)}
-            
-            선택된 관광지의 인덱스를 쉼표로 구분하여 반환해주세요 (예: 0,3,7,12,5):
-            """
+            # 후보가 많으면 청크별 순위 → 병합 순위 (map-reduce)
+            chunk_size = max(2, getattr(settings, 'GEMINI_RERANK_CHUNK_SIZE', 80))
+            if len(spots) > chunk_size:
+                spots = self._order_by_local_score(spots, analysis, catalog)
+                return self._rank_spots_map_reduce(user_query, spots, max_results, catalog, chunk_size)
             
-            response = self.model.generate_content(prompt)
-            indices_str = response.text.strip()
-            
-            # 인덱스 파싱
-            try:
-                indices = [int(idx.strip()) for idx in indices_str.split(',')]
-                ranked_spots = [spots[i] for i in indices if 0 <= i < len(spots)]
-                return ranked_spots[:max_results]
-            except (ValueError, IndexError):
-                logger.warning(f"Failed to parse ranking indices: {indices_str}")
-                return spots[:max_results]
+            ranked_spots = self._rank_chunk(user_query, spots, max_results, catalog)
+            return ranked_spots if ranked_spots else spots[:max_results]
                 
         except Exception as e:
             logger.error(f"Error ranking spots with AI: {e}")
             return spots[:max_results]
     
+    def _rank_chunk(self, user_query: str, spots: List[Dict], max_results: int,
+                    catalog=None) -> Optional[List[Dict]]:
+        """Gemini 1회 호출로 후보 목록 순위 매기기, 응답 파싱 실패 시 None"""
+        # 카탈로그가 컨텍스트 캐시에 있으면 후보 ID만 전송
+        cached_model = self._get_cached_model(catalog)
+        if cached_model:
+            return self._rank_spots_with_cached_catalog(
+                cached_model, user_query, spots, max_results, catalog
+            )
+        
+        # 관광지 정보를 텍스트로 변환
+        spots_info = []
+        for i, spot in enumerate(spots):
+            spots_info.append(f"{i}: {spot.get('title', '')} - {spot.get('overview', '')} ({spot.get('category', '')})")
+        
+        prompt = f"""
+        사용자 쿼리: "{user_query}"
+        
+        다음 관광지들 중에서 사용자 쿼리에 가장 적합한 순서로 {max_results}개를 선택해주세요:
+        
+        {chr(10).join(spots_info)}
+        
+        선택된 관광지의 인덱스를 쉼표로 구분하여 반환해주세요 (예: 0,3,7,12,5):
+        """
+        
+        response = self.model.generate_content(prompt)
+        indices_str = response.text.strip()
+        
+        # 인덱스 파싱
+        try:
+            indices = [int(idx.strip()) for idx in indices_str.split(',')]
+        except ValueError:
+            logger.warning(f"Failed to parse ranking indices: {indices_str}")
+            return None
+        
+        ranked_spots = []
+        seen = set()
+        for i in indices:
+            if 0 <= i < len(spots) and i not in seen:
+                seen.add(i)
+                ranked_spots.append(spots[i])
+        return ranked_spots[:max_results] or None
+    
+    def _rank_spots_with_cached_catalog(self, model, user_query: str, spots: List[Dict],
+                                        max_results: int, catalog) -> Optional[List[Dict]]:
+        """컨텍스트 캐시의 카탈로그를 참조하여 ID 기반으로 순위 매기기"""
+        spot_by_id = {str(spot.get('id', spot.get('contentid', ''))): spot for spot in spots}
+        
+        # 전체 카탈로그가 후보이면 ID 목록도 생략
+        if len(spots) == len(catalog.spots):
+            candidates = '카탈로그 전체'
+        else:
+            candidates = ','.join(spot_by_id.keys())
+        
+        prompt = f"""[순위 요청]
+사용자 쿼리: "{user_query}"
+후보: {candidates}
+선택 개수: {max_results}"""
+        
+        response = model.generate_content(prompt)
+        ids_str = response.text.strip()
+        
+        ranked_spots = []
+        seen = set()
+        for raw_id in ids_str.replace('\n', ',').split(','):
+            spot_id = raw_id.strip().strip('"\'')
+            if spot_id in spot_by_id and spot_id not in seen:
+                seen.add(spot_id)
+                ranked_spots.append(spot_by_id[spot_id])
+        
+        if not ranked_spots:
+            logger.warning(f"Failed to parse ranking ids: {ids_str[:200]}")
+            return None
+        return ranked_spots[:max_results]
+    
+    def _rank_spots_map_reduce(self, user_query: str, spots: List[Dict], max_results: int,
+                               catalog, chunk_size: int) -> List[Dict]:
+        """
+        대용량 후보 순위 매기기 (토너먼트 방식)
+        후보를 청크로 나눠 병렬로 순위를 매기고, 청크 우승자들로 다시 순위를 매겨 최종 병합
+        호출 수는 요청당 GEMINI_RERANK_MAX_CALLS로 제한하며, 호출 예산을 넘는 청크는 입력 순서 유지
+        (입력은 _order_by_local_score로 정렬되어 있으므로 예산은 로컬 점수가 높은 청크에 먼저 배정)
+        """
+        max_calls = max(1, getattr(settings, 'GEMINI_RERANK_MAX_CALLS', 8))
+        max_workers = max(1, getattr(settings, 'GEMINI_RERANK_MAX_CONCURRENCY', 4))
+        winners_per_chunk = max(1, min(max_results, chunk_size // 2))
+        
+        calls_used = 0
+        candidates = spots
+        level = 0
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while len(candidates) > chunk_size:
+                chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+                
+                # 최종 병합용 호출 1회를 남겨두고, 앞쪽 청크부터 호출 예산 배정 (결정적)
+                available_calls = max(0, max_calls - calls_used - 1)
+                model_chunks = min(len(chunks), available_calls)
+                calls_used += model_chunks
+                
+                futures = [
+                    executor.submit(self._rank_chunk_safe, user_query, chunk, winners_per_chunk, catalog)
+                    for chunk in chunks[:model_chunks]
+                ]
+                chunk_results = [future.result() for future in futures]
+                chunk_results += [chunk[:winners_per_chunk] for chunk in chunks[model_chunks:]]
+                
+                candidates = self._merge_chunk_winners(chunk_results, winners_per_chunk)
+                level += 1
+                logger.info(
+                    f"Map-reduce rerank level {level}: {len(chunks)} chunks "
+                    f"({model_chunks} ranked by model) -> {len(candidates)} candidates"
+                )
+        
+        # 최종 병합 순위
+        if calls_used < max_calls:
+            ranked_spots = self._rank_chunk_safe(user_query, candidates, max_results, catalog)
+            return ranked_spots[:max_results]
+        return candidates[:max_results]
+    
+    @staticmethod
+    def _order_by_local_score(spots: List[Dict], analysis: Optional[Dict], catalog) -> List[Dict]:
+        """로컬 분석 점수 내림차순 정렬 (동점은 입력 순서), 분석 결과가 없으면 그대로 반환"""
+        if not analysis:
+            return spots
+        
+        ranker = LocalSpotRanker.for_catalog(catalog) if catalog is not None else LocalSpotRanker(spots)
+        score_by_spot = {id(spot): score for spot, score in zip(ranker.spots, ranker.score(analysis).tolist())}
+        return sorted(spots, key=lambda spot: -score_by_spot.get(id(spot), 0.0))
+    
+    def _rank_chunk_safe(self, user_query: str, chunk: List[Dict], k: int, catalog) -> List[Dict]:
+        """청크 순위 매기기 - 실패하거나 결과가 부족하면 입력 순서로 채워 항상 k개 반환"""
+        try:
+            ranked = self._rank_chunk(user_query, chunk, k, catalog) or []
+        except Exception as e:
+            logger.warning(f"Chunk ranking failed, keeping input order: {e}")
+            ranked = []
+        
+        ranked_ids = {id(spot) for spot in ranked}
+        ranked = list(ranked) + [spot for spot in chunk if id(spot) not in ranked_ids]
+        return ranked[:k]
+    
+    @staticmethod
+    def _merge_chunk_winners(chunk_results: List[List[Dict]], winners_per_chunk: int) -> List[Dict]:
+        """청크 우승자 병합 - (청크 내 순위, 청크 순서)로 정렬하여 동점을 결정적으로 처리"""
+        merged = []
+        for rank in range(winners_per_chunk):
+            for result in chunk_results:
+                if rank < len(result):
+                    merged.append(result[rank])
+        return merged
+    
     def generate_tourism_description(self, spots: List[Dict]) -> str:
         """선택된 관광지들에 대한 종합 설명 생성"""
         try:
@@ -345,11 +631,12 @@ class GeminiAIService:
             logger.error(f"Error generating tourism description: {e}")
             return ""
     
-    def recommend_tourism_spots(self, user_query: str, all_spots: List[Dict]) -> Dict:
+    def recommend_tourism_spots(self, user_query: str, all_spots: List[Dict], catalog=None,
+                                location: Optional[tuple] = None) -> Dict:
         """사용자 쿼리를 기반으로 관광지 추천"""
         try:
             # 1. 사용자 쿼리 분석
-            analysis_result = self.analyze_user_query(user_query)
+            analysis_result = self.analyze_user_query(user_query, catalog=catalog)
             
             if not analysis_result.get('success'):
                 return {
@@ -361,11 +648,20 @@ class GeminiAIService:
             
             analysis = analysis_result.get('analysis', {})
             
-            # 2. 관광지 필터링 및 순위 매기기
-            recommended_spots = self._rank_spots_with_ai(user_query, all_spots, 20)
+            # 2. 후보 축소 (로컬 분석 점수 + 벡터 의미 검색) 후 AI 순위 매기기
+            candidates = self._retrieve_candidates(user_query, all_spots, analysis, catalog)
+            recommended_spots = self._rank_spots_with_ai(user_query, candidates, 20, catalog=catalog,
+                                                         analysis=analysis)
+            
+            # 3. 다양성 재순위 + 카테고리별 최소 개수(음식점/숙박/관광지)를 만족하도록 로컬 선택
+            result_size = getattr(settings, 'RECOMMENDATION_RESULT_SIZE', 15)
+            recommended_spots = self._select_recommendations(
+                recommended_spots, all_spots, analysis, catalog, result_size, location
+            )
             
-            # 3. 데이터 정리 (중복 필드 제거)
-            cleaned_spots = [self._clean_spot_data(spot) for spot in recommended_spots[:15]]
+            # 4. 데이터 정리 (중복 필드 제거) - 카탈로그가 있으면 버전별로 미리 정리된 요약 재사용
+            clean = SpotRepresentations.for_catalog(catalog).summary if catalog else self._clean_spot_data
+            cleaned_spots = [clean(spot) for spot in recommended_spots[:result_size]]
             
             return {
                 'success': True,
@@ -383,29 +679,90 @@ class GeminiAIService:
                 'recommended_spots': []
             }
     
-    def _clean_spot_data(self, spot: Dict) -> Dict:
-        """관광지 데이터에서 중복 필드 제거 및 정리"""
-        # 필요한 필드만 선택하여 깔끔한 응답 생성
-        cleaned_spot = {
-            'id': spot.get('id', spot.get('contentid', '')),
-            'title': spot.get('title', ''),
-            'category': spot.get('category', ''),
-            'addr1': spot.get('addr1', ''),
-            'addr2': spot.get('addr2', ''),
-            'overview': spot.get('overview', ''),
-            'tel': spot.get('tel', ''),
-            'homepage': spot.get('homepage', ''),
-            'firstimage': spot.get('firstimage', ''),
-            'firstimage2': spot.get('firstimage2', ''),
-            'latitude': spot.get('latitude', spot.get('mapy', '')),
-            'longitude': spot.get('longitude', spot.get('mapx', '')),
-            'contentid': spot.get('contentid', ''),
-            'contenttypeid': spot.get('contenttypeid', ''),
-            'areacode': spot.get('areacode', ''),
-            'sigungucode': spot.get('sigungucode', ''),
-            'booktour': spot.get('booktour', ''),
-            'tags': spot.get('tags', [])
-        }
+    def _retrieve_candidates(self, user_query: str, all_spots: List[Dict], analysis: Dict,
+                             catalog) -> List[Dict]:
+        """
+        Gemini 재순위 전 후보 축소 - 로컬 분석 점수가 있는 관광지 + 벡터 인덱스 의미 검색 결과
+        RECOMMENDATION_CANDIDATE_POOL_SIZE개 이내로 줄여 전체 카탈로그 재순위(map-reduce)를 피함
+        로컬 점수와 벡터 검색 모두 근거가 없으면 전체 후보 유지
+        """
+        pool_size = getattr(settings, 'RECOMMENDATION_CANDIDATE_POOL_SIZE', 80)
+        if catalog is None or all_spots is not catalog.spots or len(all_spots) <= pool_size:
+            return all_spots
+        
+        # 글자가 겹치지 않는 쿼리(아이랑 갈만한 곳 등)는 벡터 검색으로 후보 확보
+        vector_hits = []
+        index = load_vector_index(getattr(settings, 'TOURISM_VECTOR_INDEX_PATH', 'vector_index'))
+        if index is not None:
+            query_text = ' '.join([user_query] + [str(keyword) for keyword in analysis.get('keywords', [])])
+            vector_hits = [spot for spot, _ in index.search_catalog(
+                catalog, query_text, getattr(settings, 'RECOMMENDATION_VECTOR_CANDIDATES', 20),
+                getattr(settings, 'RECOMMENDATION_VECTOR_MIN_SCORE', 0.1)
+            )]
+        
+        ranker = LocalSpotRanker.for_catalog(catalog)
+        scores = ranker.score(analysis)
+        local_hits = [ranker.spots[row] for row in ranker.top_k(scores, pool_size) if scores[row] > 0]
+        if not local_hits and not vector_hits:
+            return all_spots
+        
+        # 벡터 결과 자리를 남기고 로컬 상위부터 채움 (중복 제거)
+        candidates = {}
+        for spot in local_hits[:max(0, pool_size - len(vector_hits))] + vector_hits + local_hits:
+            candidates.setdefault(id(spot), spot)
+        candidates = list(candidates.values())[:pool_size]
+        logger.info(
+            f"Candidate retrieval: {len(local_hits)} local + {len(vector_hits)} vector -> {len(candidates)} candidates"
+        )
+        return candidates
+    
+    def _select_recommendations(self, ranked_spots: List[Dict], all_spots: List[Dict],
+                                analysis: Dict, catalog, result_size: int,
+                                location: Optional[tuple] = None) -> List[Dict]:
+        """
+        AI 순위 결과에 위치 가중치, 다양성 재순위(MMR), 카테고리 할당량 적용
+        AI가 고른 관광지가 항상 앞서도록 점수를 부여하고, 나머지는 로컬 분석 점수로 채워
+        할당량이 부족하거나 결과가 비슷한 관광지로 채워져도 Gemini를 다시 호출하지 않음
+        """
+        quotas = getattr(settings, 'RECOMMENDATION_CATEGORY_QUOTAS', {})
+        mmr_lambda = getattr(settings, 'RECOMMENDATION_MMR_LAMBDA', 0.7)
+        if not all_spots or (not quotas and location is None and (catalog is None or mmr_lambda >= 1.0)):
+            return ranked_spots
         
-        # 빈 값 제거
-        return {k: v for k, v in cleaned_spot.items() if v is not None and v != ''}
+        ranker = LocalSpotRanker.for_catalog(catalog) if catalog else LocalSpotRanker(all_spots)
+        local_scores = ranker.score(analysis)
+        
+        # 사용자 위치가 있으면 거리 감쇠 항을 로컬 점수에 더함 (전체 좌표 벡터화 haversine)
+        proximity = None
+        if location is not None:
+            proximity = ranker.proximity(
+                location[0], location[1], getattr(settings, 'RECOMMENDATION_DISTANCE_SCALE_KM', 5.0)
+            ) * getattr(settings, 'RECOMMENDATION_DISTANCE_WEIGHT', 20.0)
+            local_scores = local_scores + proximity
+        local_scores = local_scores.tolist()
+        
+        ai_bonus = max(local_scores, default=0.0) + 1.0
+        ai_positions = {id(spot): position for position, spot in enumerate(ranked_spots)}
+        
+        candidates = []
+        for index, (spot, local_score) in enumerate(zip(ranker.spots, local_scores)):
+            position = ai_positions.get(id(spot))
+            if position is not None:
+                local_score = ai_bonus + len(ranked_spots) - position
+                if proximity is not None:
+                    local_score += float(proximity[index])
+            candidates.append((spot, local_score))
+        
+        # 할당량을 만족하는 후보 풀에서 비슷한 관광지가 몰리지 않도록 재정렬
+        if catalog is not None and mmr_lambda < 1.0:
+            pool_size = max(result_size, getattr(settings, 'RECOMMENDATION_MMR_POOL_SIZE', 60))
+            pool = select_top_k_with_quotas(candidates, pool_size, quotas)
+            candidates = diversify(pool, pool_size, catalog, mmr_lambda)
+        
+        selected = select_top_k_with_quotas(candidates, result_size, quotas)
+        return [spot for spot, _ in selected]
+    
+    @staticmethod
+    def _clean_spot_data(spot: Dict) -> Dict:
+        """관광지 데이터에서 중복 필드 제거 및 정리"""
+        return clean_spot_data(spot)
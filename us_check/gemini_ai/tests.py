@@ -1,3 +1,128 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .context_cache import GeminiContextCache, LocalCacheBackend
+
+
+class FakeClock:
+    """테스트용 시계 (advance로 시간 이동)"""
+
+    def __init__(self):
+        self.now = datetime.datetime(2024, 1, 1, 9, 0, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+class FailingBackend(LocalCacheBackend):
+    """캐시 생성이 항상 실패하는 백엔드"""
+
+    def __init__(self):
+        super().__init__()
+        self.create_calls = 0
+
+    def create(self, *args, **kwargs):
+        self.create_calls += 1
+        raise RuntimeError('cached content unavailable')
+
+
+class EchoModel:
+    def generate_content(self, prompt, **kwargs):
+        return prompt
+
+
+SPOTS = [
+    {'id': '1', 'title': '빙계계곡', 'category': '자연관광지', 'overview': '여름 피서지'},
+    {'id': '2', 'title': '고운사', 'category': '사찰', 'overview': '천년 고찰'},
+]
+
+
+class GeminiContextCacheTests(SimpleTestCase):
+    def make_cache(self, backend=None, ttl=1000, retire_grace=300):
+        backend = backend or LocalCacheBackend(EchoModel())
+        cache = GeminiContextCache(backend, '시스템 지시문', ['요청 안내'], ttl=ttl, retire_grace=retire_grace)
+        clock = FakeClock()
+        cache._now = clock
+        return cache, backend, clock
+
+    def test_reuses_handle_for_same_catalog_version(self):
+        cache, backend, _ = self.make_cache()
+        model = cache.get_model('v1', SPOTS)
+
+        self.assertIs(cache.get_model('v1', SPOTS), model)
+        self.assertEqual(len(backend.handles), 1)
+        self.assertEqual(cache.version, 'v1')
+
+    def test_cached_prefix_contains_catalog(self):
+        cache, _, _ = self.make_cache()
+        prompt = cache.get_model('v1', SPOTS).generate_content('질문')
+
+        self.assertTrue(prompt.startswith('요청 안내\n\n[의성군 관광지 카탈로그 version=v1]'))
+        self.assertIn('1|빙계계곡|자연관광지|여름 피서지', prompt)
+        self.assertTrue(prompt.endswith('\n\n질문'))
+
+    def test_refreshes_when_catalog_version_changes(self):
+        cache, backend, _ = self.make_cache()
+        old_model = cache.get_model('v1', SPOTS)
+        new_model = cache.get_model('v2', SPOTS[:1])
+
+        self.assertIsNot(new_model, old_model)
+        self.assertEqual(cache.version, 'v2')
+        self.assertEqual(
+            sorted(handle['display_name'] for handle in backend.handles.values()),
+            ['us-check-catalog-v1', 'us-check-catalog-v2'],
+        )
+
+    def test_refreshes_at_ninety_percent_of_ttl(self):
+        cache, backend, clock = self.make_cache(ttl=1000)
+        model = cache.get_model('v1', SPOTS)
+
+        clock.advance(899)
+        self.assertIs(cache.get_model('v1', SPOTS), model)
+
+        clock.advance(1)
+        refreshed = cache.get_model('v1', SPOTS)
+        self.assertIsNot(refreshed, model)
+        self.assertEqual(len(backend.handles), 2)
+
+    def test_retired_handle_is_deleted_after_grace_period(self):
+        cache, backend, clock = self.make_cache(retire_grace=300)
+        cache.get_model('v1', SPOTS)
+        old_name = cache._handle['name']
+
+        # 교체 직후에는 진행 중인 호출을 위해 이전 핸들 유지
+        cache.get_model('v2', SPOTS)
+        self.assertIn(old_name, backend.handles)
+
+        clock.advance(299)
+        cache.get_model('v3', SPOTS)
+        self.assertIn(old_name, backend.handles)
+
+        clock.advance(1)
+        cache.invalidate()
+        self.assertNotIn(old_name, backend.handles)
+
+    def test_failed_version_is_not_retried(self):
+        backend = FailingBackend()
+        cache, _, _ = self.make_cache(backend=backend)
+
+        self.assertIsNone(cache.get_model('v1', SPOTS))
+        self.assertIsNone(cache.get_model('v1', SPOTS))
+        self.assertEqual(backend.create_calls, 1)
+
+        # 새 카탈로그 버전이나 invalidate 후에는 다시 시도
+        self.assertIsNone(cache.get_model('v2', SPOTS))
+        self.assertEqual(backend.create_calls, 2)
+        cache.invalidate()
+        self.assertIsNone(cache.get_model('v2', SPOTS))
+        self.assertEqual(backend.create_calls, 3)
+
+    def test_empty_catalog_version_skips_cache(self):
+        cache, backend, _ = self.make_cache()
+
+        self.assertIsNone(cache.get_model('', SPOTS))
+        self.assertEqual(backend.handles, {})
@@ -14,6 +14,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'us_check.settings')
 django.setup()
 
 from django.conf import settings
+from tourism.services import FirestoreTourismService
 
 def load_data_to_firestore():
     """us_tourdata.txt 데이터를 Firestore에 로드"""
@@ -49,16 +50,23 @@ def load_data_to_firestore():
         # Firestore 컬렉션 참조
         collection_ref = db.collection('tourism_spots')
         
-        # 기존 데이터 삭제 확인
-        existing_docs = list(collection_ref.stream())
-        if existing_docs:
-            print(f"⚠️  기존 {len(existing_docs)}개 문서가 존재합니다.")
+        # 기존 데이터 삭제 확인 (문서 목록 전체를 메모리에 올리지 않음)
+        tourism_service = FirestoreTourismService()
+        if collection_ref.limit(1).get():
+            print("⚠️  기존 문서가 존재합니다.")
             response = input("기존 데이터를 모두 삭제하고 새로 로드하시겠습니까? (y/N): ")
             if response.lower() == 'y':
                 print("🗑️  기존 데이터 삭제 중...")
-                for doc in existing_docs:
-                    doc.reference.delete()
-                print("✅ 기존 데이터 삭제 완료")
+                deleted_count = 0
+                batch = db.batch()
+                for spot in tourism_service.iter_tourism_spots(fields=[]):
+                    batch.delete(collection_ref.document(spot['id']))
+                    deleted_count += 1
+                    if deleted_count % 500 == 0:
+                        batch.commit()
+                        batch = db.batch()
+                batch.commit()
+                print(f"✅ 기존 데이터 {deleted_count}개 삭제 완료")
             else:
                 print("❌ 작업이 취소되었습니다.")
                 return
@@ -121,6 +129,9 @@ def load_data_to_firestore():
                     'cat1': item.get('cat1', '').strip(),
                     'cat2': item.get('cat2', '').strip(),
                     'cat3': item.get('cat3', '').strip(),
+                    'lclsSystm1': item.get('lclsSystm1', '').strip(),
+                    'lclsSystm2': item.get('lclsSystm2', '').strip(),
+                    'lclsSystm3': item.get('lclsSystm3', '').strip(),
                     
                     # 기타 정보
                     'zipcode': item.get('zipcode', '').strip(),
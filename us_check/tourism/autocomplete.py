@@ -0,0 +1,134 @@
+"""
+관광지 이름 자동완성 - 카탈로그 버전별 접두사 트라이
+음절 트라이와 초성 트라이를 함께 만들고, 노드마다 정보 충실도(대표 이미지·소개글 유무) 순 상위 k개를 미리 저장하여 조회는 입력 길이만큼의 사전 탐색으로 끝남
+"""
+import logging
+from typing import Dict, List, Tuple
+
+from .fuzzy import title_variants
+from .hangul import choseong, is_choseong_query
+from .sampling import spot_content_weight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 10
+
+
+class _TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.top: List[Tuple[float, int]] = []  # (-가중치, 행) 오름차순
+
+
+class PrefixTrie:
+    """노드별 상위 k개 행을 보관하는 접두사 트라이"""
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.root = _TrieNode()
+        self.top_k = top_k
+
+    def _offer(self, node: _TrieNode, entry: Tuple[float, int]):
+        top = node.top
+        if any(row == entry[1] for _, row in top):
+            return
+        if len(top) < self.top_k:
+            top.append(entry)
+            top.sort()
+        elif entry < top[-1]:
+            top[-1] = entry
+            top.sort()
+
+    def insert(self, key: str, row: int, weight: float):
+        entry = (-weight, row)
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+            self._offer(node, entry)
+
+    def lookup(self, prefix: str) -> List[int]:
+        """접두사로 시작하는 키의 행 목록 (가중치순, 최대 top_k)"""
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [row for _, row in node.top]
+
+    def lookup_mixed(self, query: str) -> List[int]:
+        """
+        음절과 초성이 섞인 접두사(빙ㄱ)로 시작하는 키의 행 목록 (가중치순, 최대 top_k)
+        초성 위치에서는 같은 초성의 음절 자식으로 모두 분기하고, 도달한 노드들의 상위 k개를 병합
+        (노드들의 하위 트리는 서로 겹치지 않으므로 병합 결과가 전체 상위 k개와 같음)
+        """
+        nodes = [self.root]
+        for char in query:
+            if is_choseong_query(char):
+                nodes = [child for node in nodes for key, child in node.children.items() if choseong(key) == char]
+            else:
+                nodes = [node.children[char] for node in nodes if char in node.children]
+            if not nodes:
+                return []
+
+        rows = []
+        seen = set()
+        for _, row in sorted(entry for node in nodes for entry in node.top):
+            if row not in seen:
+                seen.add(row)
+                rows.append(row)
+                if len(rows) >= self.top_k:
+                    break
+        return rows
+
+
+class SpotAutocomplete:
+    """카탈로그 단위 관광지 이름 자동완성"""
+
+    def __init__(self, spots: List[Dict], top_k: int = DEFAULT_TOP_K):
+        self.spots = spots
+        self.syllables = PrefixTrie(top_k)
+        self.initials = PrefixTrie(top_k)
+        self.keys: List[List[str]] = []
+
+        for row, spot in enumerate(spots):
+            weight = spot_content_weight(spot)
+            variants = title_variants(spot.get('title', spot.get('name', '')))
+            self.keys.append(variants)
+            for variant in variants:
+                self.syllables.insert(variant, row, weight)
+                self.initials.insert(choseong(variant), row, weight)
+
+        # 응답용 요약은 미리 만들어 두고 조회 시 그대로 반환
+        self.summaries = [
+            {
+                'id': spot.get('id', spot.get('contentid', '')),
+                'title': spot.get('title', ''),
+                'category': spot.get('category', ''),
+            }
+            for spot in spots
+        ]
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'SpotAutocomplete':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('autocomplete', lambda snapshot: cls(snapshot.spots))
+
+    def suggest(self, query: str, limit: int = DEFAULT_TOP_K) -> List[Dict]:
+        """입력 접두사에 맞는 관광지 요약 목록 (정보 충실도순)"""
+        query = ''.join(str(query).split()).lower()
+        if not query:
+            return []
+
+        if is_choseong_query(query):
+            rows = self.initials.lookup(query)
+        else:
+            rows = self.syllables.lookup(query)
+            if not rows and any(is_choseong_query(char) for char in query):
+                # 입력 중인 음절(빙ㄱ)은 음절 트라이에서 초성 위치를 분기하며 탐색
+                rows = self.syllables.lookup_mixed(query)
+
+        return [self.summaries[row] for row in rows[:limit]]
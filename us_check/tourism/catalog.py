@@ -0,0 +1,151 @@
+"""
+관광지 카탈로그 스냅샷 캐시
+Firestore에서 읽은 관광지 목록을 프로세스 메모리에 보관하고,
+내용 기반 카탈로그 버전으로 파생 데이터(인덱스, AI 캐시 등)를 구분
+"""
+import bisect
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSnapshot:
+    """특정 시점의 관광지 카탈로그 (읽기 전용으로 사용)"""
+
+    def __init__(self, spots: List[Dict], loaded_at: float = None):
+        self.spots = spots
+        self.loaded_at = loaded_at or time.time()
+        self.version = self.compute_version(spots)
+        self._derived: Dict[str, Any] = {}
+        # 파생 데이터 생성 중 다른 파생 데이터를 참조할 수 있으므로 재진입 가능한 락 사용
+        self._derived_lock = threading.RLock()
+
+    @staticmethod
+    def compute_version(spots: List[Dict]) -> str:
+        """관광지 데이터 내용으로 카탈로그 버전 계산"""
+        digest = hashlib.sha1()
+        for spot in sorted(spots, key=lambda s: str(s.get('id', ''))):
+            digest.update(json.dumps(spot, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def derived(self, name: str, builder: Callable[['CatalogSnapshot'], Any]) -> Any:
+        """카탈로그 버전별 파생 데이터를 한 번만 생성하여 재사용"""
+        value = self._derived.get(name)
+        if value is not None:
+            return value
+
+        with self._derived_lock:
+            value = self._derived.get(name)
+            if value is None:
+                started = time.perf_counter()
+                value = builder(self)
+                self._derived[name] = value
+                logger.info(
+                    f'카탈로그 파생 데이터 생성: {name} (version={self.version}, '
+                    f'{(time.perf_counter() - started) * 1000:.1f}ms)'
+                )
+        return value
+
+    @property
+    def id_index(self) -> Dict[str, Dict]:
+        """관광지 ID 색인 (문서 ID, contentid, 이전 firestore_id → 관광지)"""
+        return self.derived('id_index', self._build_id_index)
+
+    @staticmethod
+    def _build_id_index(snapshot: 'CatalogSnapshot') -> Dict[str, Dict]:
+        index: Dict[str, Dict] = {}
+        # 별칭을 먼저 넣고 문서 ID로 덮어써서 문서 ID가 항상 우선
+        for alias_field in ('firestore_id', 'contentid'):
+            for spot in snapshot.spots:
+                alias = spot.get(alias_field)
+                if alias:
+                    index.setdefault(str(alias), spot)
+        for spot in snapshot.spots:
+            if spot.get('id'):
+                index[str(spot['id'])] = spot
+        return index
+
+    @property
+    def id_order(self) -> Tuple[List[str], List[Dict]]:
+        """문서 ID 오름차순 (ID 목록, 관광지 목록) - Firestore 문서 ID 정렬과 같은 순서"""
+        return self.derived('id_order', self._build_id_order)
+
+    @staticmethod
+    def _build_id_order(snapshot: 'CatalogSnapshot') -> Tuple[List[str], List[Dict]]:
+        ordered = sorted((str(spot['id']), spot) for spot in snapshot.spots if spot.get('id'))
+        return [spot_id for spot_id, _ in ordered], [spot for _, spot in ordered]
+
+    def page_after(self, after: Optional[str], limit: int) -> Tuple[List[Dict], bool]:
+        """문서 ID 키셋 페이지: after 다음 ID부터 limit개와 다음 페이지 존재 여부"""
+        spot_ids, spots = self.id_order
+        start = bisect.bisect_right(spot_ids, after) if after else 0
+        return spots[start:start + limit], start + limit < len(spots)
+
+    def get_spot(self, spot_id) -> Optional[Dict]:
+        """ID(문서 ID, contentid, firestore_id)로 관광지 조회, 없으면 None"""
+        return self.id_index.get(str(spot_id))
+
+    def __len__(self) -> int:
+        return len(self.spots)
+
+
+class CatalogCache:
+    """관광지 카탈로그 스냅샷 캐시 (프로세스 단위, TTL 기반)"""
+
+    def __init__(self, ttl: float = None):
+        self.ttl = ttl if ttl is not None else getattr(settings, 'TOURISM_CATALOG_TTL', 300)
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+
+    def peek(self) -> Optional[CatalogSnapshot]:
+        """캐시가 유효하면 스냅샷 반환, 아니면 None (Firestore 조회 없음)"""
+        snapshot = self._snapshot
+        if snapshot and time.time() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        return None
+
+    def get(self, loader: Callable[[], List[Dict]]) -> CatalogSnapshot:
+        """유효한 스냅샷 반환, 만료되었으면 loader로 다시 적재"""
+        snapshot = self.peek()
+        if snapshot:
+            return snapshot
+
+        with self._lock:
+            snapshot = self.peek()
+            if snapshot:
+                return snapshot
+
+            spots = loader()
+            previous = self._snapshot
+            snapshot = CatalogSnapshot(spots)
+            if not spots:
+                # 조회 실패 또는 빈 컬렉션은 캐시하지 않음
+                return snapshot
+
+            if previous and previous.version == snapshot.version:
+                # 내용이 같으면 기존 파생 데이터를 그대로 유지
+                previous.loaded_at = snapshot.loaded_at
+                snapshot = previous
+            else:
+                logger.info(f'카탈로그 적재: {len(spots)}개 관광지 (version={snapshot.version})')
+                # ID 색인은 상세 조회가 바로 쓰도록 적재 시점에 생성
+                snapshot.id_index
+            self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self):
+        """다음 조회 시 Firestore에서 다시 적재하도록 캐시 만료"""
+        with self._lock:
+            if self._snapshot:
+                self._snapshot.loaded_at = 0
+
+
+# 전역 카탈로그 캐시
+catalog_cache = CatalogCache()
@@ -0,0 +1,132 @@
+"""
+지도 클러스터 인덱스 - 줌 레벨별 계층형 격자 클러스터
+카탈로그 버전별로 모든 줌 레벨의 격자 집계를 미리 계산하고, 요청 시 bbox 안의 클러스터만 반환
+줌이 1 오르면 격자 크기가 절반이 되므로 상위 레벨 셀은 하위 레벨 셀 4개를 포함
+"""
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .geo import spot_coordinates
+
+logger = logging.getLogger(__name__)
+
+MAX_CLUSTER_ZOOM = 15            # 이 줌보다 크면 개별 관광지 반환
+CELLS_PER_TILE = 4               # 256px 타일 하나를 4x4 셀(약 64px)로 분할
+MAX_CLUSTERS = 400               # 응답 클러스터 수 상한 (넘으면 더 낮은 줌으로 집계)
+MAX_SPOTS = 300                  # 개별 관광지 응답 상한
+
+
+def _spot_id(spot: Dict) -> str:
+    return str(spot.get('id', spot.get('contentid', '')))
+
+
+class _ZoomLevel:
+    """한 줌 레벨의 격자 집계 (셀별 개수, 중심 좌표, 대표 관광지)"""
+
+    def __init__(self, zoom: int, latitudes: np.ndarray, longitudes: np.ndarray):
+        self.zoom = zoom
+        self.cell_size = 360.0 / (2 ** zoom * CELLS_PER_TILE)
+
+        cell_x = np.floor((longitudes + 180.0) / self.cell_size).astype(np.int64)
+        cell_y = np.floor((latitudes + 90.0) / self.cell_size).astype(np.int64)
+        keys = cell_x * (2 ** 40) + cell_y
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+        self.counts = np.bincount(inverse).astype(np.int64)
+        self.latitudes = np.bincount(inverse, weights=latitudes) / self.counts
+        self.longitudes = np.bincount(inverse, weights=longitudes) / self.counts
+        # 셀마다 첫 번째 관광지 행 (단일 관광지 셀을 개별 관광지로 표시할 때 사용)
+        first_rows = np.full(unique_keys.size, -1, dtype=np.int64)
+        first_rows[inverse[::-1]] = np.arange(inverse.size)[::-1]
+        self.first_rows = first_rows
+
+    def __len__(self) -> int:
+        return self.counts.size
+
+    def in_bbox(self, bbox: Tuple[float, float, float, float]) -> np.ndarray:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        return np.flatnonzero(
+            (self.longitudes >= min_lon) & (self.longitudes <= max_lon)
+            & (self.latitudes >= min_lat) & (self.latitudes <= max_lat)
+        )
+
+
+class SpotClusterIndex:
+    """카탈로그 단위 줌 레벨별 클러스터 인덱스"""
+
+    def __init__(self, spots: List[Dict]):
+        latitudes, longitudes = spot_coordinates(spots)
+        located = ~(np.isnan(latitudes) | np.isnan(longitudes))
+
+        self.rows = np.flatnonzero(located)
+        self.spots = spots
+        self.latitudes = latitudes[located]
+        self.longitudes = longitudes[located]
+        self.levels = [
+            _ZoomLevel(zoom, self.latitudes, self.longitudes) for zoom in range(MAX_CLUSTER_ZOOM + 1)
+        ] if self.rows.size else []
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'SpotClusterIndex':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('cluster_index', lambda snapshot: cls(snapshot.spots))
+
+    def _spot_summary(self, position: int) -> Dict:
+        spot = self.spots[self.rows[position]]
+        return {
+            'type': 'spot',
+            'id': _spot_id(spot),
+            'title': spot.get('title', ''),
+            'category': spot.get('category', ''),
+            'latitude': float(self.latitudes[position]),
+            'longitude': float(self.longitudes[position]),
+            'firstimage2': spot.get('firstimage2', '')
+        }
+
+    def query(self, bbox: Tuple[float, float, float, float], zoom: int) -> Dict:
+        """bbox 안의 클러스터(저줌) 또는 개별 관광지(고줌) 반환, 응답 크기는 상한으로 제한"""
+        if not self.levels:
+            return {'zoom': zoom, 'clusters': [], 'truncated': False}
+
+        min_lon, min_lat, max_lon, max_lat = bbox
+        if zoom > MAX_CLUSTER_ZOOM:
+            inside = np.flatnonzero(
+                (self.longitudes >= min_lon) & (self.longitudes <= max_lon)
+                & (self.latitudes >= min_lat) & (self.latitudes <= max_lat)
+            )
+            if inside.size <= MAX_SPOTS:
+                return {
+                    'zoom': zoom,
+                    'clusters': [self._spot_summary(position) for position in inside],
+                    'truncated': False
+                }
+            zoom = MAX_CLUSTER_ZOOM
+
+        # 클러스터 수가 상한을 넘으면 더 낮은 줌(더 큰 셀)으로 집계
+        level_zoom = max(0, min(zoom, MAX_CLUSTER_ZOOM))
+        while True:
+            level = self.levels[level_zoom]
+            cells = level.in_bbox(bbox)
+            if cells.size <= MAX_CLUSTERS or level_zoom == 0:
+                break
+            level_zoom -= 1
+
+        truncated = cells.size > MAX_CLUSTERS
+        if truncated:
+            cells = cells[np.argsort(-level.counts[cells], kind='stable')[:MAX_CLUSTERS]]
+
+        clusters = []
+        for cell in cells:
+            if level.counts[cell] == 1:
+                clusters.append(self._spot_summary(int(level.first_rows[cell])))
+            else:
+                clusters.append({
+                    'type': 'cluster',
+                    'count': int(level.counts[cell]),
+                    'latitude': float(level.latitudes[cell]),
+                    'longitude': float(level.longitudes[cell])
+                })
+
+        return {'zoom': level_zoom, 'clusters': clusters, 'truncated': truncated}
@@ -0,0 +1,97 @@
+"""
+관광지 패싯 필터 - 카탈로그 버전별 비트맵 색인
+패싯 값마다 관광지 행 집합을 파이썬 정수 비트셋으로 보관하고, 필터는 같은 패싯 안에서 OR, 패싯 사이에서 AND로 계산
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .taxonomy import TAXONOMY_SYSTEMS, TaxonomyIndex
+
+logger = logging.getLogger(__name__)
+
+FACETS = ('category', 'contenttypeid', 'sigungucode', 'has_image', 'has_phone', 'tags') + tuple(TAXONOMY_SYSTEMS)
+
+
+def _flag(value) -> str:
+    return 'true' if value else 'false'
+
+
+def spot_facet_values(spot: Dict) -> Dict[str, List[str]]:
+    """관광지 하나의 패싯별 값 목록"""
+    return {
+        'category': [str(spot.get('category') or '기타')],
+        'contenttypeid': [str(spot.get('contenttypeid', ''))] if spot.get('contenttypeid') else [],
+        'sigungucode': [str(spot.get('sigungucode', ''))] if spot.get('sigungucode') else [],
+        'has_image': [_flag(spot.get('firstimage'))],
+        'has_phone': [_flag(str(spot.get('tel') or '').strip())],
+        'tags': [str(tag) for tag in spot.get('tags', []) or [] if tag],
+    }
+
+
+class FacetIndex:
+    """패싯 값별 비트맵 (비트 i = 카탈로그 i번째 관광지)"""
+
+    def __init__(self, spots: List[Dict], taxonomy: Optional[TaxonomyIndex] = None):
+        self.spots = spots
+        self.all_bits = (1 << len(spots)) - 1
+        self.bitmaps: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+
+        for row, spot in enumerate(spots):
+            bit = 1 << row
+            for facet, values in spot_facet_values(spot).items():
+                bitmaps = self.bitmaps[facet]
+                for value in values:
+                    bitmaps[value] = bitmaps.get(value, 0) | bit
+
+        # 분류 코드 패싯(cat, lcls): 상위 코드 비트셋은 모든 하위 분류를 포함
+        taxonomy = taxonomy or TaxonomyIndex(spots)
+        for system in TAXONOMY_SYSTEMS:
+            self.bitmaps[system] = taxonomy.code_bits(system)
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'FacetIndex':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived(
+            'facet_index', lambda snapshot: cls(snapshot.spots, TaxonomyIndex.for_catalog(snapshot))
+        )
+
+    def facet_bits(self, facet: str, values: Iterable[str]) -> int:
+        """한 패싯 안의 값들을 OR한 비트맵"""
+        bitmaps = self.bitmaps.get(facet, {})
+        bits = 0
+        for value in values:
+            bits |= bitmaps.get(str(value), 0)
+        return bits
+
+    def match(self, filters: Dict[str, List[str]], exclude: Optional[str] = None) -> int:
+        """패싯 필터를 만족하는 관광지 비트맵 (exclude 패싯은 조건에서 제외)"""
+        bits = self.all_bits
+        for facet, values in filters.items():
+            if facet != exclude and values:
+                bits &= self.facet_bits(facet, values)
+        return bits
+
+    def counts(self, filters: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+        """
+        패싯 값별 개수
+        각 패싯은 자기 자신을 뺀 나머지 필터를 적용한 결과로 세어, 같은 패싯의 다른 값을 추가 선택했을 때의 개수를 보여줌
+        """
+        result = {}
+        for facet, bitmaps in self.bitmaps.items():
+            base = self.match(filters, exclude=facet)
+            counts = {value: (base & bits).bit_count() for value, bits in bitmaps.items()}
+            result[facet] = {
+                value: count
+                for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+                if count
+            }
+        return result
+
+    def rows(self, bits: int) -> np.ndarray:
+        """비트맵의 행 번호 배열 (카탈로그 순서)"""
+        if not bits:
+            return np.zeros(0, dtype=np.int64)
+        packed = np.frombuffer(bits.to_bytes((len(self.spots) + 7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(packed, bitorder='little')[:len(self.spots)])
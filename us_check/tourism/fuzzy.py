@@ -0,0 +1,153 @@
+"""
+오타 허용 관광지 이름 검색 - 자모 분해 제목에 대한 BK-tree
+편집 거리는 비트 병렬(Myers) 알고리즘으로 계산하여 후보 하나당 자모 수만큼의 정수 연산만 수행
+"""
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .hangul import decompose
+
+logger = logging.getLogger(__name__)
+
+# 제목에서 제거할 부가 표기: [한국관광 품질인증/...], (의성), (2, 7일) 등
+_ANNOTATION_PATTERN = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+MIN_QUERY_JAMO = 4
+
+
+def title_variants(title: str) -> List[str]:
+    """관광지 제목의 검색용 변형 (공백 제거 전체 제목, 두 글자 이상 단어) - 부가 표기 제거, 소문자"""
+    cleaned = _ANNOTATION_PATTERN.sub(' ', str(title)).lower()
+    variants = [''.join(cleaned.split())] + [word for word in cleaned.split() if len(word) >= 2]
+    return list(dict.fromkeys(variant for variant in variants if variant))
+
+
+def title_keys(title: str) -> List[str]:
+    """관광지 하나의 색인 키 (제목 변형을 자모 분해)"""
+    return list(dict.fromkeys(decompose(variant) for variant in title_variants(title)))
+
+
+def default_max_distance(jamo_length: int) -> int:
+    """쿼리 길이(자모 수)에 따른 허용 편집 거리"""
+    if jamo_length < MIN_QUERY_JAMO:
+        return 0
+    if jamo_length <= 6:
+        return 1
+    if jamo_length <= 12:
+        return 2
+    return 3
+
+
+class _Pattern:
+    """Myers 비트 병렬 편집 거리용 쿼리 전처리"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        self.mask = (1 << self.length) - 1
+        self.high = 1 << (self.length - 1) if self.length else 0
+        self.peq: Dict[str, int] = {}
+        for position, char in enumerate(text):
+            self.peq[char] = self.peq.get(char, 0) | (1 << position)
+
+    def distance(self, other: str) -> int:
+        """쿼리와 other 사이의 레벤슈타인 거리"""
+        if not self.length:
+            return len(other)
+        mask, high, peq = self.mask, self.high, self.peq
+        pv, mv, score = mask, 0, self.length
+        for char in other:
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+        return score
+
+
+class BKTree:
+    """레벤슈타인 거리 기반 BK-tree (키마다 관광지 행 목록 보관)"""
+
+    def __init__(self):
+        self.root: Optional[list] = None  # [키, 행 목록, {거리: 자식 노드}]
+        self.size = 0
+
+    def add(self, key: str, row: int):
+        if self.root is None:
+            self.root = [key, [row], {}]
+            self.size = 1
+            return
+
+        node = self.root
+        while True:
+            distance = _Pattern(key).distance(node[0])
+            if distance == 0:
+                if row not in node[1]:
+                    node[1].append(row)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, [row], {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, int]]:
+        """편집 거리 max_distance 이내 키의 (거리, 행) 목록"""
+        if self.root is None:
+            return []
+
+        pattern = _Pattern(query)
+        results = []
+        stack = [self.root]
+        while stack:
+            key, rows, children = stack.pop()
+            distance = pattern.distance(key)
+            if distance <= max_distance:
+                results.extend((distance, row) for row in rows)
+            # 삼각 부등식: |d(q, 자식) - d(q, 부모)| <= d(부모, 자식)
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in children.items() if low <= edge <= high)
+        return results
+
+
+class FuzzyTitleIndex:
+    """카탈로그 단위 오타 허용 제목 색인"""
+
+    def __init__(self, spots: List[Dict]):
+        self.spots = spots
+        self.tree = BKTree()
+        for row, spot in enumerate(spots):
+            for key in title_keys(spot.get('title', spot.get('name', ''))):
+                self.tree.add(key, row)
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'FuzzyTitleIndex':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('fuzzy_title_index', lambda snapshot: cls(snapshot.spots))
+
+    def search_rows(self, query: str, max_distance: int = None) -> List[Tuple[int, int]]:
+        """쿼리와 비슷한 제목의 (행, 거리) 목록 - 거리, 카탈로그 순서로 정렬"""
+        key = decompose(''.join(str(query).split()).lower())
+        if max_distance is None:
+            max_distance = default_max_distance(len(key))
+        if not key:
+            return []
+
+        best: Dict[int, int] = {}
+        for distance, row in self.tree.search(key, max_distance):
+            if distance < best.get(row, max_distance + 1):
+                best[row] = distance
+        return sorted(best.items(), key=lambda item: (item[1], item[0]))
+
+    def search(self, query: str, limit: int = 10, max_distance: int = None) -> List[Tuple[Dict, int]]:
+        """쿼리와 비슷한 제목의 (관광지, 편집 거리) 목록"""
+        return [(self.spots[row], distance) for row, distance in self.search_rows(query, max_distance)[:limit]]
@@ -0,0 +1,42 @@
+"""
+관광지 좌표 유틸리티 - NumPy 벡터화 haversine 거리 계산
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def spot_coordinates(spots: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """관광지 목록의 (위도, 경도) 배열, 좌표가 없으면 NaN (latitude/longitude 우선, mapy/mapx 대체)"""
+    latitudes = np.fromiter(
+        (_to_float(spot.get('latitude') or spot.get('mapy')) for spot in spots),
+        dtype=np.float64, count=len(spots)
+    )
+    longitudes = np.fromiter(
+        (_to_float(spot.get('longitude') or spot.get('mapx')) for spot in spots),
+        dtype=np.float64, count=len(spots)
+    )
+    return latitudes, longitudes
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """두 좌표(배열 가능, 브로드캐스팅 지원) 사이의 대원 거리 (km)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distance_matrix_km(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """좌표 배열 전체에 대한 거리 행렬 (km)"""
+    return haversine_km(latitudes[:, None], longitudes[:, None], latitudes[None, :], longitudes[None, :])
@@ -0,0 +1,44 @@
+"""
+한글 자모 유틸리티 - 음절 분해 및 초성 추출
+오타 허용 검색(자모 단위 편집 거리)과 초성 자동완성에서 사용, 변환표는 모듈 로드 시 한 번 생성
+"""
+from typing import Dict
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_COUNT = 11172
+
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+             'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+
+def _build_tables():
+    jamo_table: Dict[int, str] = {}
+    choseong_table: Dict[int, str] = {}
+    for offset in range(SYLLABLE_COUNT):
+        initial, rest = divmod(offset, 21 * 28)
+        medial, final = divmod(rest, 28)
+        code = SYLLABLE_BASE + offset
+        jamo_table[code] = CHOSEONG[initial] + JUNGSEONG[medial] + JONGSEONG[final]
+        choseong_table[code] = CHOSEONG[initial]
+    return jamo_table, choseong_table
+
+
+_JAMO_TABLE, _CHOSEONG_TABLE = _build_tables()
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 호환 자모로 분해 (빙계 → ㅂㅣㅇㄱㅖ), 그 외 문자는 그대로"""
+    return text.translate(_JAMO_TABLE)
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 변환 (빙계계곡 → ㅂㄱㄱㄱ), 그 외 문자는 그대로"""
+    return text.translate(_CHOSEONG_TABLE)
+
+
+def is_choseong_query(text: str) -> bool:
+    """입력이 초성(ㄱ~ㅎ)으로만 이루어졌는지 여부"""
+    return bool(text) and all(char in _CHOSEONG_SET for char in text)
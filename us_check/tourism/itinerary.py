@@ -0,0 +1,129 @@
+"""
+선택 관광지 방문 순서 계산 - 최근접 이웃 + 2-opt
+카탈로그 버전별로 haversine 거리 행렬을 캐시하고, 선택된 관광지의 부분 행렬로 경로 계산
+"""
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .geo import distance_matrix_km, spot_coordinates
+
+logger = logging.getLogger(__name__)
+
+# 이보다 큰 카탈로그는 전체 거리 행렬을 캐시하지 않고 요청 시 부분 행렬만 계산
+MAX_CACHED_MATRIX_SPOTS = 3000
+
+
+def _spot_id(spot: Dict) -> str:
+    return str(spot.get('id', spot.get('contentid', '')))
+
+
+def nearest_neighbour_path(distances: np.ndarray, start: int) -> List[int]:
+    """start에서 출발하는 최근접 이웃 경로"""
+    n = distances.shape[0]
+    path = [start]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, distances[path[-1]])
+        nxt = int(np.argmin(row))
+        path.append(nxt)
+        visited[nxt] = True
+    return path
+
+
+def two_opt(distances: np.ndarray, path: List[int], max_passes: int = 50) -> List[int]:
+    """
+    열린 경로(출발/도착 자유)에 대한 2-opt 개선
+    거리 0인 가상 노드를 추가해 순환 경로로 바꾼 뒤, 각 i에 대해 모든 j의 개선량을 벡터로 계산
+    """
+    n = len(path)
+    if n < 3:
+        return path
+
+    padded = np.zeros((n + 1, n + 1), dtype=np.float64)
+    padded[:n, :n] = distances
+    route = np.array([n] + list(path) + [n], dtype=np.int64)  # 가상 노드로 시작/끝
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n):
+            j = np.arange(i + 1, n + 1)
+            a, b = route[i - 1], route[i]
+            c, d = route[j], route[j + 1]
+            delta = padded[a, c] + padded[b, d] - padded[a, b] - padded[c, d]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                k = j[best]
+                route[i:k + 1] = route[i:k + 1][::-1]
+                improved = True
+        if not improved:
+            break
+
+    return route[1:-1].tolist()
+
+
+class ItineraryPlanner:
+    """카탈로그 단위 방문 순서 계산기"""
+
+    def __init__(self, spots: List[Dict]):
+        self.row_by_id = {_spot_id(spot): row for row, spot in enumerate(spots)}
+        self.latitudes, self.longitudes = spot_coordinates(spots)
+        self.matrix: Optional[np.ndarray] = None
+        if len(spots) <= MAX_CACHED_MATRIX_SPOTS:
+            self.matrix = distance_matrix_km(self.latitudes, self.longitudes).astype(np.float32)
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'ItineraryPlanner':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('itinerary_planner', lambda snapshot: cls(snapshot.spots))
+
+    def _distances(self, spots: Sequence[Dict]) -> np.ndarray:
+        rows = [self.row_by_id.get(_spot_id(spot), -1) for spot in spots]
+        if self.matrix is not None and all(row >= 0 for row in rows):
+            return self.matrix[np.ix_(rows, rows)].astype(np.float64)
+        # 카탈로그 밖의 관광지가 있거나 행렬을 캐시하지 않은 경우 직접 계산
+        latitudes, longitudes = spot_coordinates(list(spots))
+        return distance_matrix_km(latitudes, longitudes)
+
+    def plan(self, spots: List[Dict]) -> Dict:
+        """방문 순서, 총 거리, 구간별 거리 계산 (좌표 없는 관광지는 마지막에 원래 순서로 배치)"""
+        latitudes, longitudes = spot_coordinates(spots)
+        located = [i for i in range(len(spots)) if not (np.isnan(latitudes[i]) or np.isnan(longitudes[i]))]
+        located_set = set(located)
+        unlocated = [i for i in range(len(spots)) if i not in located_set]
+
+        order = located
+        distances = None
+        if len(located) > 1:
+            distances = self._distances([spots[i] for i in located])
+            # 모든 출발점에서 최근접 이웃 경로를 만들어 가장 짧은 것을 2-opt로 개선
+            best_path, best_length = None, np.inf
+            for start in range(len(located)):
+                path = nearest_neighbour_path(distances, start)
+                length = distances[path[:-1], path[1:]].sum()
+                if length < best_length:
+                    best_path, best_length = path, length
+            path = two_opt(distances, best_path)
+            order = [located[i] for i in path]
+        else:
+            path = list(range(len(located)))
+
+        legs = []
+        total_distance = 0.0
+        for a, b in zip(path[:-1], path[1:]):
+            leg_distance = float(distances[a, b])
+            total_distance += leg_distance
+            legs.append({
+                'from': _spot_id(spots[located[a]]),
+                'to': _spot_id(spots[located[b]]),
+                'distance_km': round(leg_distance, 3)
+            })
+
+        return {
+            'order': [_spot_id(spots[i]) for i in order + unlocated],
+            'total_distance_km': round(total_distance, 3),
+            'legs': legs,
+            'unlocated': [_spot_id(spots[i]) for i in unlocated]
+        }
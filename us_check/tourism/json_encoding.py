@@ -0,0 +1,78 @@
+"""
+JSON 인코딩 - orjson 사용 (설치되지 않았으면 표준 json으로 대체)
+API 응답(api.renderers)과 카탈로그별로 미리 인코딩하는 관광지 조각(representations)이 같은 인코더를 사용
+"""
+import datetime
+import json
+from typing import Any, Dict, Iterable
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from google.cloud import firestore
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def json_default(obj):
+    """기본 JSON 타입이 아닌 값 변환 (Firestore 타임스탬프, 날짜, Decimal, UUID, NumPy 값 등)"""
+    if obj is firestore.SERVER_TIMESTAMP:
+        # 아직 커밋되지 않은 서버 타임스탬프는 응답 시점 시각으로 표시
+        return _django_encoder.default(timezone.now())
+    if isinstance(obj, datetime.datetime) and hasattr(obj, 'rfc3339'):
+        # Firestore DatetimeWithNanoseconds: 나노초 정밀도의 RFC 3339 문자열
+        return obj.rfc3339()
+    if hasattr(obj, 'tolist'):
+        # NumPy 배열/스칼라
+        return obj.tolist()
+    return _django_encoder.default(obj)
+
+
+if orjson is not None:
+    # 날짜/시간은 json_default로 넘겨 표준 json 경로와 같은 형식(DjangoJSONEncoder)으로 출력
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+
+    def json_dumps(data) -> bytes:
+        """UTF-8 JSON 바이트로 인코딩"""
+        try:
+            return orjson.dumps(data, default=json_default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # 64비트를 넘는 정수 등 orjson이 지원하지 않는 값은 표준 json으로 재시도
+            return _stdlib_json_dumps(data)
+else:
+    def json_dumps(data) -> bytes:
+        """UTF-8 JSON 바이트로 인코딩"""
+        return _stdlib_json_dumps(data)
+
+
+def _stdlib_json_dumps(data) -> bytes:
+    return json.dumps(data, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class RawJSON(bytes):
+    """이미 인코딩된 JSON 조각 (encode_json이 다시 직렬화하지 않고 그대로 삽입)"""
+
+
+def join_json(fragments: Iterable[bytes]) -> RawJSON:
+    """JSON 조각들을 배열로 연결"""
+    return RawJSON(b'[' + b','.join(fragments) + b']')
+
+
+def extend_json(fragment: bytes, fields: Dict[str, Any]) -> bytes:
+    """인코딩된 JSON 객체 조각 끝에 필드 추가 (조각을 다시 파싱하지 않음)"""
+    if not fields:
+        return fragment
+    extra = b','.join(json_dumps(key) + b':' + json_dumps(value) for key, value in fields.items())
+    return fragment[:-1] + (b',' if fragment != b'{}' else b'') + extra + b'}'
+
+
+def encode_json(payload: Dict[str, Any]) -> bytes:
+    """응답 객체 인코딩 - 최상위 값 중 RawJSON은 그대로 이어 붙임"""
+    return b'{' + b','.join(
+        json_dumps(key) + b':' + (value if isinstance(value, RawJSON) else json_dumps(value))
+        for key, value in payload.items()
+    ) + b'}'
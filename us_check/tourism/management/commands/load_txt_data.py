@@ -176,6 +176,12 @@ class Command(BaseCommand):
                     'latitude': latitude,
                     'longitude': longitude,
                     'category': category,
+                    'cat1': item.get('cat1', '').strip(),
+                    'cat2': item.get('cat2', '').strip(),
+                    'cat3': item.get('cat3', '').strip(),
+                    'lclsSystm1': item.get('lclsSystm1', '').strip(),
+                    'lclsSystm2': item.get('lclsSystm2', '').strip(),
+                    'lclsSystm3': item.get('lclsSystm3', '').strip(),
                     'tags': tags,
                     'contact_info': item.get('tel', '').strip(),
                     'website': '',
@@ -0,0 +1,253 @@
+"""
+로컬 관광지 랭킹 - Gemini 호출 없이 분석 결과로 점수 계산
+카탈로그 버전별로 검색 텍스트를 미리 만들어 두고 여러 쿼리를 NumPy로 한 번에 점수화
+"""
+import heapq
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .fuzzy import FuzzyTitleIndex
+from .geo import haversine_km, spot_coordinates
+from .synonyms import get_synonym_dictionary
+from .taxonomy import TaxonomyIndex
+
+logger = logging.getLogger(__name__)
+
+# 분석 결과 항목별 가중치 (키워드/카테고리/위치 일치 시 가산)
+KEYWORD_WEIGHT = 10.0
+CATEGORY_WEIGHT = 15.0
+LOCATION_WEIGHT = 20.0
+
+# 카테고리 할당량 그룹 (시스템 지시문의 음식점/숙박/관광지 최소 추천 수와 대응)
+QUOTA_GROUP_BY_CONTENT_TYPE = {
+    '39': 'restaurant',
+    '32': 'lodging',
+}
+QUOTA_GROUP_BY_CATEGORY = {
+    '음식/맛집': 'restaurant',
+    '음식점': 'restaurant',
+    '숙박시설': 'lodging',
+    '숙박': 'lodging',
+}
+DEFAULT_QUOTA_GROUP = 'attraction'
+
+
+def spot_search_text(spot: Dict) -> str:
+    """검색 대상 필드를 하나의 소문자 문자열로 합치기"""
+    searchable_fields = [
+        spot.get('name', ''),
+        spot.get('title', ''),
+        spot.get('description', ''),
+        spot.get('overview', ''),
+        spot.get('addr1', ''),
+        spot.get('category', ''),
+        ' '.join(spot.get('tags', []))
+    ]
+    return ' '.join(str(field) for field in searchable_fields).lower()
+
+
+def spot_quota_group(spot: Dict) -> str:
+    """contenttypeid(우선) 또는 category로 할당량 그룹 결정"""
+    group = QUOTA_GROUP_BY_CONTENT_TYPE.get(str(spot.get('contenttypeid', '')))
+    if group:
+        return group
+    return QUOTA_GROUP_BY_CATEGORY.get(str(spot.get('category', '')), DEFAULT_QUOTA_GROUP)
+
+
+def select_top_k_with_quotas(candidates: List[Tuple[Dict, float]], k: int, quotas: Dict[str, int],
+                             group_fn: Callable[[Dict], str] = spot_quota_group) -> List[Tuple[Dict, float]]:
+    """
+    그룹별 최소 개수를 만족하는 점수 상위 k개 선택 - O(n log k)
+    각 그룹의 상위 quota개를 먼저 확보하고 남은 자리는 전체 상위 항목으로 채움
+    후보가 부족한 그룹은 가능한 만큼만 확보하며, 동점은 입력 순서가 앞선 항목 우선
+    """
+    if k <= 0 or not candidates:
+        return []
+
+    # 힙 항목: (점수, -입력순서) → 최솟값이 가장 낮은 순위
+    group_heaps: Dict[str, List[Tuple[float, int]]] = {group: [] for group, quota in quotas.items() if quota > 0}
+    overall_heap: List[Tuple[float, int]] = []
+
+    for index, (spot, score) in enumerate(candidates):
+        entry = (score, -index)
+        group = group_fn(spot)
+        heap = group_heaps.get(group)
+        if heap is not None:
+            if len(heap) < quotas[group]:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        if len(overall_heap) < k:
+            heapq.heappush(overall_heap, entry)
+        elif entry > overall_heap[0]:
+            heapq.heapreplace(overall_heap, entry)
+
+    reserved = sorted((entry for heap in group_heaps.values() for entry in heap), reverse=True)[:k]
+    reserved_indices = {-neg_index for _, neg_index in reserved}
+
+    # 남은 자리: 예약되지 않은 항목 중 상위 (전체 상위 k 안에 반드시 포함됨)
+    selected = list(reserved)
+    for entry in sorted(overall_heap, reverse=True):
+        if len(selected) >= k:
+            break
+        if -entry[1] not in reserved_indices:
+            selected.append(entry)
+
+    selected.sort(reverse=True)
+    return [candidates[-neg_index] for _, neg_index in selected]
+
+
+class LocalSpotRanker:
+    """카탈로그 단위로 생성되는 로컬 랭커"""
+
+    MAX_CACHED_MASKS = 4096
+
+    def __init__(self, spots: List[Dict], fuzzy_index: Optional[FuzzyTitleIndex] = None,
+                 taxonomy: Optional[TaxonomyIndex] = None):
+        self.spots = spots
+        self._fuzzy_index = fuzzy_index
+        self._taxonomy = taxonomy
+        self.texts = [spot_search_text(spot) for spot in spots]
+        self.categories = [str(spot.get('category', '')).lower() for spot in spots]
+        self.addresses = [str(spot.get('addr1', '')).lower() for spot in spots]
+        self._fields = {
+            'keyword': self.texts,
+            'category': self.categories,
+            'location': self.addresses,
+        }
+        self._mask_cache: Dict[Tuple[str, Tuple[str, ...]], np.ndarray] = {}
+        self.latitudes, self.longitudes = spot_coordinates(spots)
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'LocalSpotRanker':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived(
+            'local_ranker', lambda snapshot: cls(
+                snapshot.spots, FuzzyTitleIndex.for_catalog(snapshot), TaxonomyIndex.for_catalog(snapshot)
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.spots)
+
+    @property
+    def fuzzy_index(self) -> FuzzyTitleIndex:
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyTitleIndex(self.spots)
+        return self._fuzzy_index
+
+    @property
+    def taxonomy(self) -> TaxonomyIndex:
+        if self._taxonomy is None:
+            self._taxonomy = TaxonomyIndex(self.spots)
+        return self._taxonomy
+
+    def _term_mask(self, field: str, terms: Tuple[str, ...]) -> np.ndarray:
+        """필드에 동의어 그룹 중 하나라도 포함된 관광지 마스크 (그룹별로 캐시)"""
+        key = (field, terms)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            values = self._fields[field]
+            mask = np.fromiter((any(term in value for term in terms) for value in values),
+                               dtype=bool, count=len(values))
+            if field == 'category':
+                # 분류 코드(A0201, B02, HS01 등)는 하위 분류까지 구간 조회로 매칭
+                for term in terms:
+                    mask[self.taxonomy.rows_for_code(term)] = True
+            if field == 'keyword' and not mask.any():
+                # 어디에도 없는 키워드는 오타로 보고 비슷한 이름의 관광지로 대체 (빙게계곡 → 빙계계곡)
+                for row, _ in self.fuzzy_index.search_rows(terms[0]):
+                    mask[row] = True
+            if len(self._mask_cache) >= self.MAX_CACHED_MASKS:
+                self._mask_cache.clear()
+            self._mask_cache[key] = mask
+        return mask
+
+    @staticmethod
+    def _analysis_terms(analysis: Dict) -> List[Tuple[str, Tuple[str, ...], float]]:
+        """분석 결과를 (필드, 동의어 그룹, 가중치) 목록으로 변환"""
+        synonyms = get_synonym_dictionary()
+        terms = []
+        for keywords in synonyms.expand_groups(analysis.get('keywords', [])):
+            terms.append(('keyword', keywords, KEYWORD_WEIGHT))
+        for categories in synonyms.expand_groups(analysis.get('categories', [])):
+            terms.append(('category', categories, CATEGORY_WEIGHT))
+        for location in analysis.get('locations', []) or []:
+            location = str(location).lower()
+            if location:
+                terms.append(('location', (location,), LOCATION_WEIGHT))
+        return terms
+
+    def score_batch(self, analyses: List[Dict]) -> np.ndarray:
+        """여러 분석 결과를 (쿼리 수 x 관광지 수) 점수 행렬로 한 번에 계산"""
+        n_spots = len(self.spots)
+        if not analyses or not n_spots:
+            return np.zeros((len(analyses), n_spots), dtype=np.float32)
+
+        # 모든 쿼리에 등장한 term을 한 번씩만 매칭
+        term_index: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        query_terms = []
+        for analysis in analyses:
+            entries = []
+            for field, terms, weight in self._analysis_terms(analysis):
+                column = term_index.setdefault((field, terms), len(term_index))
+                entries.append((column, weight))
+            query_terms.append(entries)
+
+        if not term_index:
+            return np.zeros((len(analyses), n_spots), dtype=np.float32)
+
+        term_matrix = np.zeros((len(term_index), n_spots), dtype=np.float32)
+        for (field, terms), row in term_index.items():
+            term_matrix[row] = self._term_mask(field, terms)
+
+        query_matrix = np.zeros((len(analyses), len(term_index)), dtype=np.float32)
+        for row, entries in enumerate(query_terms):
+            for column, weight in entries:
+                query_matrix[row, column] += weight
+
+        return query_matrix @ term_matrix
+
+    def score(self, analysis: Dict) -> np.ndarray:
+        """단일 분석 결과의 관광지별 점수"""
+        return self.score_batch([analysis])[0]
+
+    def proximity(self, latitude: float, longitude: float, scale_km: float) -> np.ndarray:
+        """사용자 위치 기준 거리 감쇠 점수 exp(-거리/scale) (좌표 없는 관광지는 0)"""
+        distances = haversine_km(latitude, longitude, self.latitudes, self.longitudes)
+        return np.nan_to_num(np.exp(-distances / scale_km), nan=0.0).astype(np.float32)
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """점수 상위 k개 인덱스 (동점은 카탈로그 순서로 결정)"""
+        n = scores.shape[0]
+        k = min(k, n)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < n:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+            # 경계 동점 처리: k번째 점수와 같은 항목은 인덱스 순으로 선택
+            threshold = scores[candidates].min()
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)[:k - above.size]
+            candidates = np.concatenate([above, ties])
+        else:
+            candidates = np.arange(n)
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order]
+
+    def rank_batch(self, analyses: List[Dict], limit: int,
+                   quotas: Optional[Dict[str, int]] = None) -> List[List[Tuple[Dict, float]]]:
+        """여러 분석 결과를 한 번에 랭킹하여 (관광지, 점수) 목록 반환"""
+        scores = self.score_batch(analyses)
+        results = []
+        for row in scores:
+            if quotas:
+                candidates = list(zip(self.spots, row.tolist()))
+                results.append(select_top_k_with_quotas(candidates, limit, quotas))
+            else:
+                indices = self.top_k(row, limit)
+                results.append([(self.spots[i], float(row[i])) for i in indices])
+        return results
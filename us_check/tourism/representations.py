@@ -0,0 +1,80 @@
+"""
+관광지 응답 표현 사전 계산 - 카탈로그 버전별로 정리된 요약(dict)과 요약/상세 JSON 바이트를 한 번만 생성
+응답은 미리 인코딩된 관광지 조각을 이어 붙여 만들므로 요청당 비용이 관광지 필드 수와 무관
+"""
+import logging
+from typing import Dict, Iterable, List
+
+from .json_encoding import RawJSON, join_json, json_dumps
+
+logger = logging.getLogger(__name__)
+
+
+def clean_spot_data(spot: Dict) -> Dict:
+    """관광지 데이터에서 중복 필드 제거 및 정리 (추천/목록 응답용 요약)"""
+    # 필요한 필드만 선택하여 깔끔한 응답 생성
+    cleaned_spot = {
+        'id': spot.get('id', spot.get('contentid', '')),
+        'title': spot.get('title', ''),
+        'category': spot.get('category', ''),
+        'addr1': spot.get('addr1', ''),
+        'addr2': spot.get('addr2', ''),
+        'overview': spot.get('overview', ''),
+        'tel': spot.get('tel', ''),
+        'homepage': spot.get('homepage', ''),
+        'firstimage': spot.get('firstimage', ''),
+        'firstimage2': spot.get('firstimage2', ''),
+        'latitude': spot.get('latitude', spot.get('mapy', '')),
+        'longitude': spot.get('longitude', spot.get('mapx', '')),
+        'contentid': spot.get('contentid', ''),
+        'contenttypeid': spot.get('contenttypeid', ''),
+        'areacode': spot.get('areacode', ''),
+        'sigungucode': spot.get('sigungucode', ''),
+        'booktour': spot.get('booktour', ''),
+        'tags': spot.get('tags', [])
+    }
+
+    # 빈 값 제거
+    return {k: v for k, v in cleaned_spot.items() if v is not None and v != ''}
+
+
+class SpotRepresentations:
+    """카탈로그 관광지별 요약 dict, 요약 JSON, 상세(원본 문서) JSON"""
+
+    def __init__(self, spots: List[Dict]):
+        # 행 조회 키가 id()이므로 관광지 객체가 살아 있도록 참조 유지
+        self.spots = spots
+        self._rows = {id(spot): row for row, spot in enumerate(spots)}
+        self.summaries = [clean_spot_data(spot) for spot in spots]
+        self.summary_bytes = [RawJSON(json_dumps(summary)) for summary in self.summaries]
+        self.detail_bytes = [RawJSON(json_dumps(spot)) for spot in spots]
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'SpotRepresentations':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('spot_representations', lambda snapshot: cls(snapshot.spots))
+
+    def _row(self, spot: Dict):
+        # 카탈로그에 속한 dict만 캐시 대상 (Firestore에서 따로 읽은 dict는 그때그때 계산)
+        return self._rows.get(id(spot))
+
+    def summary(self, spot: Dict) -> Dict:
+        """정리된 요약 dict (캐시 공유 객체이므로 수정하지 말 것)"""
+        row = self._row(spot)
+        return self.summaries[row] if row is not None else clean_spot_data(spot)
+
+    def summary_json(self, spot: Dict) -> RawJSON:
+        row = self._row(spot)
+        return self.summary_bytes[row] if row is not None else RawJSON(json_dumps(clean_spot_data(spot)))
+
+    def detail_json(self, spot: Dict) -> RawJSON:
+        row = self._row(spot)
+        return self.detail_bytes[row] if row is not None else RawJSON(json_dumps(spot))
+
+    def summaries_json(self, spots: Iterable[Dict]) -> RawJSON:
+        """요약 목록 JSON 배열"""
+        return join_json(self.summary_json(spot) for spot in spots)
+
+    def details_json(self, spots: Iterable[Dict]) -> RawJSON:
+        """상세 목록 JSON 배열"""
+        return join_json(self.detail_json(spot) for spot in spots)
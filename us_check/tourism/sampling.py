@@ -0,0 +1,127 @@
+"""
+파친코 게임용 가중 랜덤 추출 - Walker/Vose 별칭(alias) 테이블
+카탈로그 버전별, 카테고리별 테이블을 미리 만들어 한 번 추출에 O(1)
+"""
+import random
+from typing import Dict, List, Optional, Sequence
+
+# 관광지 가중치 구성
+IMAGE_BONUS = 1.5
+OVERVIEW_BONUS = 1.2
+
+
+class AliasTable:
+    """Vose 별칭 방법 - O(n) 생성, O(1) 추출"""
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        if n == 0:
+            raise ValueError('weights must not be empty')
+        total = float(sum(weights))
+        if total <= 0:
+            weights = [1.0] * n
+            total = float(n)
+
+        self.size = n
+        self.probability = [0.0] * n
+        self.alias = [0] * n
+
+        scaled = [weight * n / total for weight in weights]
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # 부동소수점 오차로 남은 항목은 확률 1
+        for i in large + small:
+            self.probability[i] = 1.0
+
+    def sample(self, rng: random.Random = random) -> int:
+        """가중치에 비례하여 인덱스 하나 추출"""
+        column = int(rng.random() * self.size)
+        return column if rng.random() < self.probability[column] else self.alias[column]
+
+
+def spot_content_weight(spot: Dict) -> float:
+    """
+    관광지 정보 충실도 가중치 - 대표 이미지와 소개글 유무만 반영
+    (적재 데이터에 조회수 등 인기 지표가 없으므로 인기도가 아님)
+    """
+    weight = 1.0
+    if spot.get('firstimage'):
+        weight *= IMAGE_BONUS
+    if spot.get('overview'):
+        weight *= OVERVIEW_BONUS
+    return weight
+
+
+class PachinkoFeed:
+    """카탈로그 단위 가중 추출기 (전체 + 카테고리별 별칭 테이블)"""
+
+    def __init__(self, spots: List[Dict]):
+        self.spots = spots
+        weights = [spot_content_weight(spot) for spot in spots]
+
+        self.members: Dict[str, List[int]] = {}
+        for index, spot in enumerate(spots):
+            self.members.setdefault(str(spot.get('category', '기타')), []).append(index)
+
+        self.category_tables: Dict[str, AliasTable] = {
+            category: AliasTable([weights[i] for i in indices])
+            for category, indices in self.members.items()
+        }
+
+        # 전체 테이블은 카테고리마다 같은 총 질량을 갖도록 균형 조정
+        balanced = list(weights)
+        for indices in self.members.values():
+            category_total = sum(weights[i] for i in indices)
+            for i in indices:
+                balanced[i] = weights[i] / category_total if category_total > 0 else 0.0
+        self.overall_table = AliasTable(balanced) if spots else None
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'PachinkoFeed':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('pachinko_feed', lambda snapshot: cls(snapshot.spots))
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self.members.keys())
+
+    def draw(self, count: int, category: Optional[str] = None,
+             rng: random.Random = random) -> List[Dict]:
+        """중복 없이 count개 가중 추출 (후보보다 많이 요청하면 가능한 만큼만)"""
+        if category is not None:
+            table = self.category_tables.get(category)
+            population = self.members.get(category, [])
+        else:
+            table = self.overall_table
+            population = range(len(self.spots))
+
+        if table is None:
+            return []
+        count = min(count, len(population))
+
+        chosen: List[int] = []
+        seen = set()
+        # 거절 샘플링 - 시도 횟수를 제한하고 부족분은 남은 후보를 가중치 무관하게 섞어서 채움
+        attempts = count * 8
+        while len(chosen) < count and attempts > 0:
+            attempts -= 1
+            index = population[table.sample(rng)]
+            if index not in seen:
+                seen.add(index)
+                chosen.append(index)
+
+        if len(chosen) < count:
+            remaining = [index for index in population if index not in seen]
+            rng.shuffle(remaining)
+            chosen.extend(remaining[:count - len(chosen)])
+
+        return [self.spots[index] for index in chosen]
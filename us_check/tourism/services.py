@@ -3,11 +3,15 @@ Tourism 서비스 - 완전히 Firestore 기반으로 리팩토링
 Django 모델 제거, 순수 Firestore 서비스
 """
 import logging
-from typing import List, Dict, Optional, Any
+import time
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, Any
 from django.conf import settings
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
 import json
+from .catalog import CatalogSnapshot, catalog_cache
+from .synonyms import get_synonym_dictionary
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,61 @@ class FirestoreTourismService:
         self.tourism_collection = 'tourism_spots'  # 실제 컬렉션명으로 변경
         self.user_selections_collection = 'user_tourism_selections'
         self.qr_codes_collection = 'qr_codes'
+        self.travel_descriptions_collection = 'travel_descriptions'
+        self.stats_collection = 'system_stats'
+        self.stats_counter_doc = 'counters'
+    
+    # =============================================================================
+    # 컬렉션 스트리밍 조회
+    # =============================================================================
+    
+    def iter_collection(self, collection_name: str, page_size: int = None, start_after: str = None,
+                        fields: List[str] = None, filters: List[FieldFilter] = None) -> Iterator[Dict]:
+        """
+        컬렉션 문서를 문서 ID 순으로 페이지 단위 스트리밍 (메모리에는 한 페이지만 유지)
+        start_after: 마지막으로 처리한 문서 ID (중단된 순회 재개용 커서)
+        fields: select()로 가져올 필드 (빈 목록이면 문서 ID만)
+        """
+        if not self.db:
+            return
+        
+        page_size = page_size or getattr(settings, 'FIRESTORE_PAGE_SIZE', 500)
+        collection = self.db.collection(collection_name)
+        query = collection
+        for field_filter in filters or []:
+            query = query.where(filter=field_filter)
+        if fields is not None:
+            # 빈 목록은 문서 ID만 조회하는 키 전용 쿼리
+            query = query.select(fields or [firestore.FieldPath.document_id()])
+        query = query.order_by(firestore.FieldPath.document_id())
+        
+        cursor = start_after
+        while True:
+            page_query = query
+            if cursor:
+                page_query = page_query.start_after({firestore.FieldPath.document_id(): collection.document(cursor)})
+            
+            count = 0
+            for doc in page_query.limit(page_size).stream():
+                data = doc.to_dict() or {}
+                data['id'] = doc.id
+                cursor = doc.id
+                count += 1
+                yield data
+            
+            if count < page_size:
+                return
+    
+    def iter_tourism_spots(self, page_size: int = None, start_after: str = None,
+                           fields: List[str] = None) -> Iterator[Dict]:
+        """관광지 문서 스트리밍 조회 (문서 ID 순, start_after로 재개)"""
+        return self.iter_collection(self.tourism_collection, page_size, start_after, fields)
+    
+    def iter_user_selections(self, page_size: int = None, start_after: str = None,
+                             fields: List[str] = None, status: str = None) -> Iterator[Dict]:
+        """사용자 선택 기록 스트리밍 조회 (문서 ID 순, start_after로 재개, status로 필터)"""
+        filters = [FieldFilter('status', '==', status)] if status else None
+        return self.iter_collection(self.user_selections_collection, page_size, start_after, fields, filters)
     
     # =============================================================================
     # 관광지 데이터 관리
@@ -34,13 +93,7 @@ class FirestoreTourismService:
             if not self.db:
                 return []
             
-            docs = self.db.collection(self.tourism_collection).stream()
-            
-            spots = []
-            for doc in docs:
-                spot_data = doc.to_dict()
-                spot_data['id'] = doc.id
-                spots.append(spot_data)
+            spots = list(self.iter_tourism_spots())
             
             logger.info(f'총 {len(spots)}개의 관광지 데이터 조회')
             return spots
@@ -49,6 +102,14 @@ class FirestoreTourismService:
             logger.error(f'관광지 데이터 조회 오류: {e}')
             return []
     
+    def get_catalog(self) -> CatalogSnapshot:
+        """캐시된 관광지 카탈로그 스냅샷 조회 (만료 시 Firestore에서 재적재)"""
+        return catalog_cache.get(self.get_all_tourism_spots)
+    
+    def get_catalog_version(self) -> str:
+        """현재 카탈로그 버전 조회"""
+        return self.get_catalog().version
+    
     def get_tourism_spot_by_id(self, spot_id: str) -> Optional[Dict]:
         """ID로 특정 관광지 조회"""
         try:
@@ -68,18 +129,89 @@ class FirestoreTourismService:
             logger.error(f'관광지 조회 오류 (ID: {spot_id}): {e}')
             return None
     
+    def get_spots_by_ids(self, spot_ids: List[str]) -> Dict:
+        """
+        여러 관광지를 한 번에 조회 - 카탈로그 캐시가 유효하면 캐시에서 먼저 찾고,
+        캐시에 없는 ID(스냅샷 이후 추가된 관광지 등)는 db.get_all() 한 번으로 조회
+        반환: {'spots': 입력 순서의 관광지 목록, 'missing_ids': 찾지 못한 ID 목록}
+        """
+        spot_ids = list(dict.fromkeys(str(spot_id) for spot_id in spot_ids if spot_id))
+        
+        found = {}
+        catalog = catalog_cache.peek()
+        if catalog is not None:
+            for spot_id in spot_ids:
+                spot = catalog.get_spot(spot_id)
+                if spot:
+                    found[spot_id] = spot
+        
+        unresolved_ids = [spot_id for spot_id in spot_ids if spot_id not in found]
+        try:
+            if self.db and unresolved_ids:
+                collection = self.db.collection(self.tourism_collection)
+                for doc in self.db.get_all([collection.document(spot_id) for spot_id in unresolved_ids]):
+                    if doc.exists:
+                        spot_data = doc.to_dict()
+                        spot_data['id'] = doc.id
+                        found[doc.id] = spot_data
+        except Exception as e:
+            logger.error(f'관광지 일괄 조회 오류: {e}')
+        
+        spots = [found[spot_id] for spot_id in spot_ids if found.get(spot_id)]
+        missing_ids = [spot_id for spot_id in spot_ids if not found.get(spot_id)]
+        if missing_ids:
+            logger.warning(f'관광지 일괄 조회 - 찾을 수 없는 ID: {missing_ids}')
+        
+        return {
+            'spots': spots,
+            'missing_ids': missing_ids
+        }
+    
+    def get_spots_page(self, limit: int, after: str = None, fields: List[str] = None) -> Dict:
+        """
+        관광지 목록 키셋 페이지 조회 (문서 ID 순으로 after 다음부터 limit개)
+        카탈로그 캐시가 유효하면 캐시에서 잘라 필요한 필드만 투영하고,
+        아니면 select(fields) + start_after + limit 쿼리 한 번으로 조회
+        fields: 응답에 포함할 필드 (None이면 전체, id는 항상 포함)
+        반환: {'spots': 관광지 목록, 'next_cursor': 다음 페이지 after 값 (마지막 페이지면 None),
+               'total_count': 전체 관광지 수}
+        """
+        catalog = catalog_cache.peek()
+        if catalog is not None:
+            page, has_more = catalog.page_after(after, limit)
+            total_count = len(catalog.spots)
+        else:
+            # 한 건 더 읽어 다음 페이지 존재 여부 판단
+            page = list(islice(self.iter_tourism_spots(page_size=limit + 1, start_after=after, fields=fields),
+                               limit + 1))
+            has_more = len(page) > limit
+            page = page[:limit]
+            # 전체 수는 count() 집계 쿼리로 (문서를 읽지 않음)
+            total_count = self._count_documents(self.tourism_collection) if self.db else len(page)
+        
+        if fields is not None:
+            page = [
+                dict({'id': spot.get('id')}, **{field: spot[field] for field in fields if field in spot})
+                for spot in page
+            ]
+        
+        return {
+            'spots': page,
+            'next_cursor': page[-1]['id'] if has_more and page else None,
+            'total_count': total_count
+        }
+    
     def search_tourism_spots_by_keyword(self, keyword: str) -> List[Dict]:
         """키워드로 관광지 검색 (클라이언트 사이드 필터링)"""
         try:
-            all_spots = self.get_all_tourism_spots()
-            
             if not keyword:
-                return all_spots
+                return self.get_all_tourism_spots()
             
             keyword_lower = keyword.lower()
             filtered_spots = []
             
-            for spot in all_spots:
+            # 일치하는 관광지만 모으며 스트리밍 (전체 목록을 만들지 않음)
+            for spot in self.iter_tourism_spots():
                 # 여러 필드에서 키워드 검색
                 searchable_fields = [
                     spot.get('name', ''),
@@ -147,6 +279,9 @@ class FirestoreTourismService:
             doc_ref = self.db.collection(self.tourism_collection).document(doc_id)
             doc_ref.set(spot_data)
             
+            catalog_cache.invalidate()
+            # 같은 ID 덮어쓰기일 수 있으므로 카운터는 다음 통계 조회 때 재집계
+            self._mark_counters_stale()
             logger.info(f'관광지 추가: {spot_data.get("name", doc_id)}')
             return {'success': True, 'id': doc_id}
             
@@ -166,6 +301,7 @@ class FirestoreTourismService:
             doc_ref = self.db.collection(self.tourism_collection).document(spot_id)
             doc_ref.update(spot_data)
             
+            catalog_cache.invalidate()
             logger.info(f'관광지 업데이트: {spot_id}')
             return {'success': True, 'id': spot_id}
             
@@ -185,6 +321,7 @@ class FirestoreTourismService:
                 'deleted_at': firestore.SERVER_TIMESTAMP
             })
             
+            catalog_cache.invalidate()
             logger.info(f'관광지 삭제: {spot_id}')
             return {'success': True, 'id': spot_id}
             
@@ -208,6 +345,7 @@ class FirestoreTourismService:
             
             doc_ref = self.db.collection(self.user_selections_collection).document()
             doc_ref.set(selection_data)
+            self._increment_counter('user_selections')
             
             logger.info(f'사용자 선택 저장: {doc_ref.id}')
             return {'success': True, 'id': doc_ref.id}
@@ -257,6 +395,7 @@ class FirestoreTourismService:
             
             doc_ref = self.db.collection(self.qr_codes_collection).document()
             doc_ref.set(qr_data)
+            self._increment_counter('qr_codes')
             
             logger.info(f'QR 코드 정보 저장: {doc_ref.id}')
             return {'success': True, 'id': doc_ref.id}
@@ -284,6 +423,40 @@ class FirestoreTourismService:
             logger.error(f'QR 코드 정보 조회 오류: {e}')
             return None
     
+    # =============================================================================
+    # 여행 설명 캐시 관리
+    # =============================================================================
+    
+    def get_travel_description(self, cache_key: str) -> Optional[Dict]:
+        """캐시된 여행 설명 조회"""
+        try:
+            if not self.db:
+                return None
+            
+            doc = self.db.collection(self.travel_descriptions_collection).document(cache_key).get()
+            return doc.to_dict() if doc.exists else None
+            
+        except Exception as e:
+            logger.error(f'여행 설명 캐시 조회 오류: {e}')
+            return None
+    
+    def save_travel_description(self, cache_key: str, description_data: Dict) -> Dict:
+        """여행 설명 캐시 저장"""
+        try:
+            if not self.db:
+                return {'success': False, 'message': 'Firestore client not initialized'}
+            
+            description_data['created_at'] = firestore.SERVER_TIMESTAMP
+            
+            doc_ref = self.db.collection(self.travel_descriptions_collection).document(cache_key)
+            doc_ref.set(description_data)
+            
+            return {'success': True, 'id': cache_key}
+            
+        except Exception as e:
+            logger.error(f'여행 설명 캐시 저장 오류: {e}')
+            return {'success': False, 'message': str(e)}
+    
     # =============================================================================
     # 데이터 마이그레이션 및 초기화
     # =============================================================================
@@ -321,6 +494,8 @@ class FirestoreTourismService:
             if uploaded_count % 500 != 0:
                 batch.commit()
             
+            catalog_cache.invalidate()
+            self._mark_counters_stale()
             logger.info(f'총 {uploaded_count}개 관광지 데이터 업로드 완료')
             return {'success': True, 'uploaded_count': uploaded_count}
             
@@ -329,7 +504,11 @@ class FirestoreTourismService:
             return {'success': False, 'message': str(e)}
     
     def get_database_stats(self) -> Dict:
-        """데이터베이스 통계 정보"""
+        """
+        데이터베이스 통계 정보
+        카운터 문서가 켜져 있고 DATABASE_STATS_STALENESS 이내에 재집계되었으면 문서 읽기 1회로 응답,
+        아니면 count() 집계 쿼리로 다시 세고 카운터 문서를 갱신
+        """
         try:
             stats = {
                 'tourism_spots': 0,
@@ -340,7 +519,15 @@ class FirestoreTourismService:
             if not self.db:
                 return stats
             
-            # 각 컬렉션의 문서 수 조회
+            counters_enabled = getattr(settings, 'DATABASE_STATS_COUNTERS_ENABLED', False)
+            if counters_enabled:
+                counter_doc = self._stats_counter_ref().get()
+                counters = counter_doc.to_dict() if counter_doc.exists else {}
+                staleness = getattr(settings, 'DATABASE_STATS_STALENESS', 300)
+                if counters and time.time() - counters.get('refreshed_at', 0) <= staleness:
+                    return {key: int(counters.get(key, 0)) for key in stats}
+            
+            # 각 컬렉션의 문서 수를 집계 쿼리로 조회 (문서를 읽지 않음)
             collections = [
                 (self.tourism_collection, 'tourism_spots'),
                 (self.user_selections_collection, 'user_selections'),
@@ -348,15 +535,46 @@ class FirestoreTourismService:
             ]
             
             for collection_name, stat_key in collections:
-                docs = self.db.collection(collection_name).stream()
-                count = sum(1 for _ in docs)
-                stats[stat_key] = count
+                stats[stat_key] = self._count_documents(collection_name)
+            
+            if counters_enabled:
+                self._stats_counter_ref().set(dict(stats, refreshed_at=time.time()))
             
             return stats
             
         except Exception as e:
             logger.error(f'통계 조회 오류: {e}')
             return {'error': str(e)}
+    
+    def _count_documents(self, collection_name: str) -> int:
+        """count() 집계 쿼리로 문서 수 조회 (지원하지 않는 환경에서는 문서 ID 스트리밍으로 대체)"""
+        try:
+            result = self.db.collection(collection_name).count(alias='count').get()
+            return int(result[0][0].value)
+        except Exception as e:
+            logger.warning(f'집계 쿼리 실패, 문서 스트리밍으로 계산 ({collection_name}): {e}')
+            return sum(1 for _ in self.iter_collection(collection_name, fields=[]))
+    
+    def _stats_counter_ref(self):
+        return self.db.collection(self.stats_collection).document(self.stats_counter_doc)
+    
+    def _increment_counter(self, stat_key: str, amount: int = 1):
+        """쓰기 시 카운터 문서 증가 (카운터 사용 시에만, 실패해도 본 작업에는 영향 없음)"""
+        if not amount or not getattr(settings, 'DATABASE_STATS_COUNTERS_ENABLED', False):
+            return
+        try:
+            self._stats_counter_ref().set({stat_key: firestore.Increment(amount)}, merge=True)
+        except Exception as e:
+            logger.warning(f'통계 카운터 증가 실패 ({stat_key}): {e}')
+    
+    def _mark_counters_stale(self):
+        """카운터를 정확히 증가시킬 수 없는 쓰기 후 다음 통계 조회에서 재집계하도록 표시"""
+        if not getattr(settings, 'DATABASE_STATS_COUNTERS_ENABLED', False):
+            return
+        try:
+            self._stats_counter_ref().set({'refreshed_at': 0}, merge=True)
+        except Exception as e:
+            logger.warning(f'통계 카운터 만료 처리 실패: {e}')
 
     # =============================================================================
     # API 호환성을 위한 메서드들
@@ -370,17 +588,18 @@ class FirestoreTourismService:
         """API 호환성을 위한 메서드 - get_tourism_spot_by_id와 동일"""
         return self.get_tourism_spot_by_id(spot_id)
     
-    def search_spots_by_keywords(self, keywords: List[str]) -> List[Dict]:
-        """키워드 리스트로 관광지 검색"""
+    def search_spots_by_keywords(self, keywords: List[str], spots: Iterable[Dict] = None) -> List[Dict]:
+        """키워드 리스트로 관광지 검색 (spots: 검색 대상, 없으면 Firestore 스트리밍 조회)"""
         try:
-            all_spots = self.get_all_tourism_spots()
-            
             if not keywords:
-                return all_spots
+                return list(spots) if spots is not None else self.get_all_tourism_spots()
+            
+            # 동의어/별칭 확장 (예: 절 → 사찰, 사(의성))
+            search_keywords = get_synonym_dictionary().expand_all(keywords)
             
             filtered_spots = []
             
-            for spot in all_spots:
+            for spot in (spots if spots is not None else self.iter_tourism_spots()):
                 # 여러 필드에서 키워드 검색
                 searchable_fields = [
                     spot.get('name', ''),
@@ -397,8 +616,8 @@ class FirestoreTourismService:
                 
                 # 키워드 중 하나라도 매치되면 포함
                 match_found = False
-                for keyword in keywords:
-                    if keyword.lower() in search_text:
+                for keyword in search_keywords:
+                    if keyword in search_text:
                         match_found = True
                         break
                 
@@ -430,6 +649,7 @@ class FirestoreTourismService:
             
             # Firestore에 저장
             doc_ref.set(selection_data)
+            self._increment_counter('user_selections')
             
             logger.info(f'사용자 선택 기록 생성: {doc_ref.id}')
             return doc_ref.id
@@ -438,6 +658,38 @@ class FirestoreTourismService:
             logger.error(f'사용자 선택 기록 생성 오류: {e}')
             raise
     
+    def create_user_selections_batch(self, selections: List[Dict]) -> List[str]:
+        """여러 사용자 선택 기록을 Firestore 배치 쓰기로 한 번에 생성"""
+        try:
+            if not self.db:
+                raise Exception('Firestore client not initialized')
+            
+            collection = self.db.collection(self.user_selections_collection)
+            batch = self.db.batch()
+            doc_ids = []
+            
+            for selection_data in selections:
+                doc_ref = collection.document()
+                selection_data['id'] = doc_ref.id
+                batch.set(doc_ref, selection_data)
+                doc_ids.append(doc_ref.id)
+                
+                # 배치 크기 제한 (Firestore는 배치당 500개 제한)
+                if len(doc_ids) % 500 == 0:
+                    batch.commit()
+                    batch = self.db.batch()
+            
+            if len(doc_ids) % 500 != 0:
+                batch.commit()
+            self._increment_counter('user_selections', len(doc_ids))
+            
+            logger.info(f'사용자 선택 기록 배치 생성: {len(doc_ids)}개')
+            return doc_ids
+            
+        except Exception as e:
+            logger.error(f'사용자 선택 기록 배치 생성 오류: {e}')
+            raise
+    
     def get_user_selection(self, selection_id: str) -> Optional[Dict]:
         """특정 사용자 선택 기록 조회"""
         try:
@@ -508,12 +760,15 @@ class FirestoreTourismService:
     def sync_all_data(self) -> Dict:
         """모든 데이터 동기화"""
         try:
-            spots = self.get_all_tourism_spots()
+            # 카탈로그 캐시를 만료시키고 Firestore에서 다시 적재
+            catalog_cache.invalidate()
+            catalog = self.get_catalog()
             
             return {
                 'success': True,
-                'message': f'데이터 동기화 완료: {len(spots)}개 관광지',
-                'total_spots': len(spots)
+                'message': f'데이터 동기화 완료: {len(catalog)}개 관광지',
+                'total_spots': len(catalog),
+                'catalog_version': catalog.version
             }
             
         except Exception as e:
@@ -0,0 +1,164 @@
+"""
+관광지 간 유사도 및 다양성(MMR) 재순위
+카탈로그 버전별로 텍스트 벡터/카테고리/좌표를 미리 계산하고, 후보 집합의 유사도 행렬은 NumPy로 일괄 계산
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .geo import haversine_km, spot_coordinates
+from .text_vectors import HashingTfidfVectorizer, spot_vector_text
+
+logger = logging.getLogger(__name__)
+
+# 유사도 구성 가중치 (합 1.0)
+TEXT_WEIGHT = 0.6
+CATEGORY_WEIGHT = 0.25
+DISTANCE_WEIGHT = 0.15
+# 이 거리(km)에서 거리 유사도가 1/e로 감소
+DISTANCE_SCALE_KM = 3.0
+
+
+class SpotSimilarityIndex:
+    """카탈로그 단위 관광지 유사도 특징 (텍스트 + 카테고리 + 거리)"""
+
+    def __init__(self, spots: List[Dict]):
+        self.spots = spots
+        self.vectorizer = HashingTfidfVectorizer()
+        self.text_vectors = self.vectorizer.fit_transform([spot_vector_text(spot) for spot in spots])
+
+        category_codes: Dict[str, int] = {}
+        self.category_ids = np.array(
+            [category_codes.setdefault(str(spot.get('cat3') or spot.get('category', '')), len(category_codes))
+             for spot in spots],
+            dtype=np.int32
+        )
+        self.latitudes, self.longitudes = spot_coordinates(spots)
+        self.row_by_id = {str(spot.get('id', spot.get('contentid', ''))): row for row, spot in enumerate(spots)}
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'SpotSimilarityIndex':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('similarity_index', lambda snapshot: cls(snapshot.spots))
+
+    def rows_for(self, spots: Sequence[Dict]) -> List[int]:
+        """관광지 목록을 인덱스 행 번호로 변환 (카탈로그에 없으면 -1)"""
+        return [self.row_by_id.get(str(spot.get('id', spot.get('contentid', ''))), -1) for spot in spots]
+
+    def pairwise(self, rows: Sequence[int]) -> np.ndarray:
+        """주어진 행들 사이의 유사도 행렬 (0~1)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        return self.similarity(rows, rows)
+
+    def similarity(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """rows x columns 유사도 행렬 (텍스트 + 같은 카테고리 + 거리 감쇠)"""
+        text = self.text_vectors[rows] @ self.text_vectors[columns].T
+        same_category = (self.category_ids[rows][:, None] == self.category_ids[columns][None, :]).astype(np.float32)
+
+        distances = haversine_km(self.latitudes[rows][:, None], self.longitudes[rows][:, None],
+                                 self.latitudes[columns][None, :], self.longitudes[columns][None, :])
+        proximity = np.exp(-distances / DISTANCE_SCALE_KM)
+        proximity = np.nan_to_num(proximity, nan=0.0).astype(np.float32)
+
+        return TEXT_WEIGHT * text + CATEGORY_WEIGHT * same_category + DISTANCE_WEIGHT * proximity
+
+
+class SpotNeighbourIndex:
+    """
+    카탈로그 단위 유사 관광지 kNN 사전 계산
+    블록 단위로 유사도를 계산해 메모리를 (블록 크기 x 관광지 수)로 제한하고 상위 k개만 보관
+    """
+
+    DEFAULT_NEIGHBOURS = 20
+    BLOCK_SIZE = 512
+
+    def __init__(self, similarity_index: SpotSimilarityIndex, k: int = DEFAULT_NEIGHBOURS):
+        n = len(similarity_index.spots)
+        self.similarity_index = similarity_index
+        self.k = min(k, max(n - 1, 0))
+        self.neighbours = np.zeros((n, self.k), dtype=np.int32)
+        self.scores = np.zeros((n, self.k), dtype=np.float32)
+        if self.k == 0:
+            return
+
+        columns = np.arange(n)
+        for start in range(0, n, self.BLOCK_SIZE):
+            rows = columns[start:start + self.BLOCK_SIZE]
+            block = similarity_index.similarity(rows, columns).astype(np.float32)
+            block[np.arange(rows.size), rows] = -np.inf  # 자기 자신 제외
+
+            top = np.argpartition(-block, self.k - 1, axis=1)[:, :self.k]
+            top_scores = np.take_along_axis(block, top, axis=1)
+            # 점수 내림차순, 동점은 카탈로그 순서
+            order = np.lexsort((top, -top_scores), axis=1)
+            self.neighbours[rows] = np.take_along_axis(top, order, axis=1)
+            self.scores[rows] = np.take_along_axis(top_scores, order, axis=1)
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'SpotNeighbourIndex':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived(
+            'neighbour_index', lambda snapshot: cls(SpotSimilarityIndex.for_catalog(snapshot))
+        )
+
+    def similar(self, spot: Dict, limit: int = 10) -> Optional[List[Tuple[Dict, float]]]:
+        """관광지의 유사 관광지 (관광지, 유사도) 목록, 카탈로그에 없으면 None"""
+        row = self.similarity_index.rows_for([spot])[0]
+        if row < 0:
+            return None
+        spots = self.similarity_index.spots
+        limit = max(0, min(limit, self.k))
+        return [
+            (spots[neighbour], float(score))
+            for neighbour, score in zip(self.neighbours[row, :limit], self.scores[row, :limit])
+        ]
+
+
+def mmr_order(relevance: np.ndarray, similarity: np.ndarray, k: int, lambda_: float) -> List[int]:
+    """
+    최대 한계 관련성(MMR) 순서
+    매 단계 lambda * 관련성 - (1 - lambda) * 이미 고른 항목과의 최대 유사도가 가장 큰 항목 선택
+    """
+    n = relevance.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    # 관련성을 0~1로 정규화하여 유사도와 같은 척도로 비교
+    relevance = relevance.astype(np.float64)
+    span = relevance.max() - relevance.min()
+    relevance = (relevance - relevance.min()) / span if span > 0 else np.ones(n)
+
+    selected = []
+    available = np.ones(n, dtype=bool)
+    max_similarity = np.zeros(n, dtype=np.float64)
+    for _ in range(k):
+        objective = lambda_ * relevance - (1.0 - lambda_) * max_similarity
+        objective[~available] = -np.inf
+        choice = int(np.argmax(objective))  # 동점이면 앞선 후보
+        selected.append(choice)
+        available[choice] = False
+        max_similarity = np.maximum(max_similarity, similarity[choice])
+    return selected
+
+
+def diversify(scored_spots: List[Tuple[Dict, float]], k: int, catalog, lambda_: float) -> List[Tuple[Dict, float]]:
+    """
+    점수가 매겨진 후보를 MMR로 재정렬하여 상위 k개 반환
+    반환 점수는 MMR 순서를 반영 (앞설수록 큼), 카탈로그에 없는 후보는 원래 순서로 뒤에 붙임
+    """
+    if not scored_spots or lambda_ >= 1.0:
+        return scored_spots[:k]
+
+    index = SpotSimilarityIndex.for_catalog(catalog)
+    rows = index.rows_for([spot for spot, _ in scored_spots])
+    known = [i for i, row in enumerate(rows) if row >= 0]
+    unknown = [i for i, row in enumerate(rows) if row < 0]
+
+    relevance = np.array([scored_spots[i][1] for i in known], dtype=np.float64)
+    similarity = index.pairwise([rows[i] for i in known])
+    order = [known[i] for i in mmr_order(relevance, similarity, k, lambda_)] + unknown
+
+    order = order[:k]
+    return [(scored_spots[i][0], float(len(order) - rank)) for rank, i in enumerate(order)]
@@ -0,0 +1,91 @@
+"""
+검색어 동의어/별칭 사전
+tourism/data/synonyms.txt를 한 번 컴파일하여 검색어 → 확장어 목록 사전으로 보관 (서버 시작 시 api 앱에서 미리 로드)
+"""
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SYNONYMS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'synonyms.txt')
+
+
+def _normalize(term) -> str:
+    return ' '.join(str(term).split()).lower()
+
+
+def _unique(terms: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(term for term in terms if term))
+
+
+class SynonymDictionary:
+    """검색어를 (원래 검색어, 확장어...) 튜플로 바꾸는 사전"""
+
+    def __init__(self, expansions: Dict[str, Tuple[str, ...]]):
+        self.expansions = expansions
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> 'SynonymDictionary':
+        """사전 파일 줄들을 컴파일 (동의어 그룹은 양방향, '=>'는 단방향)"""
+        expansions: Dict[str, List[str]] = {}
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+
+            if '=>' in line:
+                source, targets = line.split('=>', 1)
+                sources = [_normalize(term) for term in source.split(',')]
+                group = sources + [_normalize(term) for term in targets.split(',')]
+            else:
+                sources = group = [_normalize(term) for term in line.split(',')]
+
+            for term in sources:
+                if term:
+                    expansions.setdefault(term, []).extend(other for other in group if other != term)
+
+        return cls({term: _unique([term] + others) for term, others in expansions.items()})
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SynonymDictionary':
+        with open(path, encoding='utf-8') as f:
+            return cls.parse(f)
+
+    def __len__(self) -> int:
+        return len(self.expansions)
+
+    def expand(self, term) -> Tuple[str, ...]:
+        """검색어 하나의 확장 그룹 (첫 항목은 원래 검색어)"""
+        term = _normalize(term)
+        return self.expansions.get(term) or ((term,) if term else ())
+
+    def expand_groups(self, terms: Iterable) -> List[Tuple[str, ...]]:
+        """검색어별 확장 그룹 목록 (점수 계산 시 그룹당 한 번만 가산)"""
+        return [group for group in (self.expand(term) for term in terms or []) if group]
+
+    def expand_all(self, terms: Iterable) -> List[str]:
+        """모든 검색어의 확장어를 중복 없이 펼친 목록"""
+        return list(_unique(term for group in self.expand_groups(terms) for term in group))
+
+
+_dictionary: Optional[SynonymDictionary] = None
+_dictionary_lock = threading.Lock()
+
+
+def get_synonym_dictionary() -> SynonymDictionary:
+    """컴파일된 동의어 사전 (처음 호출 시 한 번 로드, 파일이 없거나 잘못되면 빈 사전)"""
+    global _dictionary
+    if _dictionary is not None:
+        return _dictionary
+
+    with _dictionary_lock:
+        if _dictionary is None:
+            try:
+                _dictionary = SynonymDictionary.from_file(SYNONYMS_PATH)
+                logger.info(f'동의어 사전 로드: {len(_dictionary)}개 검색어')
+            except Exception as e:
+                logger.error(f'동의어 사전 로드 실패: {e}')
+                _dictionary = SynonymDictionary({})
+    return _dictionary
@@ -0,0 +1,146 @@
+"""
+관광지 분류 체계 색인 - 한국관광공사 3단계 분류(cat1/cat2/cat3)와 분류체계(lclsSystm1~3)
+관광지를 분류 경로 순으로 정렬해 두고 노드마다 하위 관광지 구간 [start, end)를 미리 계산하여
+상위 분류(B02 숙박, A0201 역사관광지 등) 조회를 구간 슬라이스 한 번으로 처리
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_SYSTEMS: Dict[str, Tuple[str, ...]] = {
+    'cat': ('cat1', 'cat2', 'cat3'),
+    'lcls': ('lclsSystm1', 'lclsSystm2', 'lclsSystm3'),
+}
+
+# 한국관광공사 서비스 분류 코드명 (주요 코드)
+CODE_LABELS = {
+    'A01': '자연',
+    'A02': '인문(문화/예술/역사)',
+    'A03': '레포츠',
+    'A04': '쇼핑',
+    'A05': '음식',
+    'B02': '숙박',
+    'C01': '추천코스',
+    'A0101': '자연관광지',
+    'A0102': '관광자원',
+    'A0201': '역사관광지',
+    'A0202': '휴양관광지',
+    'A0203': '체험관광지',
+    'A0204': '산업관광지',
+    'A0205': '건축/조형물',
+    'A0206': '문화시설',
+    'A0207': '축제',
+    'A0208': '공연/행사',
+    'A0302': '육상 레포츠',
+    'A0502': '음식점',
+    'B0201': '숙박시설',
+}
+
+
+class TaxonomyNode:
+    """분류 노드 - 정렬된 관광지 배열에서의 하위 구간"""
+
+    __slots__ = ('code', 'level', 'parent', 'children', 'start', 'end')
+
+    def __init__(self, code: str, level: int, parent: Optional[str], start: int):
+        self.code = code
+        self.level = level
+        self.parent = parent
+        self.children: List[str] = []
+        self.start = start
+        self.end = start
+
+    @property
+    def count(self) -> int:
+        return self.end - self.start
+
+
+class TaxonomyTree:
+    """한 분류 체계의 트리 (관광지 행을 분류 경로 순으로 정렬한 배열 + 노드별 구간)"""
+
+    def __init__(self, spots: List[Dict], fields: Tuple[str, ...]):
+        paths = []
+        for spot in spots:
+            path = []
+            for field in fields:
+                code = str(spot.get(field) or '').strip()
+                if not code:
+                    break
+                path.append(code)
+            paths.append(tuple(path))
+
+        # 분류가 없는 관광지는 트리에서 제외
+        rows = sorted((row for row, path in enumerate(paths) if path), key=lambda row: (paths[row], row))
+        self.order = np.array(rows, dtype=np.int32)
+        self.nodes: Dict[str, TaxonomyNode] = {}
+        self.roots: List[str] = []
+
+        for position, row in enumerate(rows):
+            parent = None
+            for level, code in enumerate(paths[row]):
+                node = self.nodes.get(code)
+                if node is None:
+                    node = self.nodes[code] = TaxonomyNode(code, level + 1, parent, position)
+                    (self.nodes[parent].children if parent else self.roots).append(code)
+                node.end = position + 1
+                parent = code
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.nodes
+
+    def rows(self, code: str) -> np.ndarray:
+        """분류 코드와 모든 하위 분류에 속한 관광지 행 (없는 코드는 빈 배열)"""
+        node = self.nodes.get(code)
+        if node is None:
+            return self.order[:0]
+        return self.order[node.start:node.end]
+
+    def tree(self, codes: Optional[List[str]] = None) -> List[Dict]:
+        """API 응답용 중첩 트리 (코드, 이름, 관광지 수, 하위 분류)"""
+        return [
+            {
+                'code': code,
+                'label': CODE_LABELS.get(code, ''),
+                'count': self.nodes[code].count,
+                'children': self.tree(self.nodes[code].children),
+            }
+            for code in (self.roots if codes is None else codes)
+        ]
+
+
+class TaxonomyIndex:
+    """카탈로그 단위 분류 체계 색인 (cat, lcls)"""
+
+    def __init__(self, spots: List[Dict]):
+        self.size = len(spots)
+        self.systems = {name: TaxonomyTree(spots, fields) for name, fields in TAXONOMY_SYSTEMS.items()}
+
+    @classmethod
+    def for_catalog(cls, catalog) -> 'TaxonomyIndex':
+        """카탈로그 버전별로 한 번만 생성"""
+        return catalog.derived('taxonomy_index', lambda snapshot: cls(snapshot.spots))
+
+    def rows(self, system: str, code: str) -> np.ndarray:
+        """분류 체계 안의 코드에 속한 관광지 행"""
+        return self.systems[system].rows(code)
+
+    def rows_for_code(self, code: str) -> np.ndarray:
+        """분류 체계를 구분하지 않고 코드로 관광지 행 조회 (대소문자 무시)"""
+        code = str(code).strip().upper()
+        for tree in self.systems.values():
+            if code in tree:
+                return tree.rows(code)
+        return self.systems['cat'].order[:0]
+
+    def code_bits(self, system: str) -> Dict[str, int]:
+        """분류 코드별 관광지 비트셋 (패싯 필터용, 하위 분류 포함)"""
+        tree = self.systems[system]
+        bits = {}
+        for code in tree.nodes:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[tree.rows(code)] = True
+            bits[code] = int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+        return bits
@@ -1,3 +1,386 @@
-from django.test import TestCase
+import itertools
+import random
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase
+
+from .autocomplete import SpotAutocomplete
+from .facets import FACETS, FacetIndex, spot_facet_values
+from .fuzzy import BKTree, FuzzyTitleIndex, _Pattern, title_keys, title_variants
+from .geo import distance_matrix_km, spot_coordinates
+from .hangul import choseong, decompose
+from .itinerary import ItineraryPlanner, nearest_neighbour_path
+from .ranking import select_top_k_with_quotas, spot_quota_group
+from .sampling import AliasTable, PachinkoFeed, spot_content_weight
+from .taxonomy import TAXONOMY_SYSTEMS, TaxonomyIndex
+
+# 무작위 관광지 이름용 음절
+SYLLABLES = '가각간갈감강개거건걸검게겨견고곡골공과관광구국군굴궁귀그근금기길'
+
+
+def random_spots(seed: int, count: int):
+    rng = random.Random(seed)
+    return [
+        {
+            'id': str(row),
+            'title': rng.choice('빙바보') + ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))),
+            'firstimage': 'image.jpg' if rng.random() < 0.5 else '',
+            'overview': '소개' if rng.random() < 0.5 else '',
+        }
+        for row in range(count)
+    ]
+
+
+class SpotAutocompleteTests(SimpleTestCase):
+    @staticmethod
+    def brute_force(spots, query, limit):
+        """모든 이름 변형을 직접 비교한 기준 결과"""
+        matches = []
+        for row, spot in enumerate(spots):
+            if any(
+                len(variant) >= len(query) and all(
+                    char == target or char == choseong(target) for char, target in zip(query, variant)
+                )
+                for variant in title_variants(spot['title'])
+            ):
+                matches.append((-spot_content_weight(spot), row))
+        return [spots[row]['id'] for _, row in sorted(matches)[:limit]]
+
+    def test_mixed_query_finds_matches_outside_initials_top_k(self):
+        # 초성(ㅂㄱ)이 같고 가중치가 높은 관광지가 초성 트라이 상위 k개를 모두 차지
+        spots = [
+            {'id': str(row), 'title': f'바가{row}', 'firstimage': 'image.jpg', 'overview': '소개'}
+            for row in range(12)
+        ]
+        spots.append({'id': 'target', 'title': '빙계계곡'})
+        autocomplete = SpotAutocomplete(spots, top_k=10)
+
+        self.assertEqual([spot['id'] for spot in autocomplete.suggest('빙ㄱ')], ['target'])
+        self.assertEqual([spot['id'] for spot in autocomplete.suggest('빙계ㄱ')], ['target'])
+
+    def test_mixed_query_matches_brute_force(self):
+        spots = random_spots(seed=7, count=300)
+        autocomplete = SpotAutocomplete(spots, top_k=10)
+
+        for query in ('빙ㄱ', '바ㄱ', 'ㅂ가', '보ㄱㄱ', '빙가ㄱ', 'ㅂ고ㄱ'):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    [spot['id'] for spot in autocomplete.suggest(query)],
+                    self.brute_force(spots, query, 10),
+                )
+
+
+def levenshtein(a: str, b: str) -> int:
+    """동적 계획법 기준 편집 거리"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+class SelectTopKWithQuotasTests(SimpleTestCase):
+    @staticmethod
+    def brute_force(candidates, k, quotas):
+        """그룹별 상위 quota개를 먼저 예약하고 남은 자리를 전체 상위로 채운 기준 결과"""
+        order = sorted(range(len(candidates)), key=lambda index: (-candidates[index][1], index))
+        reserved = set()
+        for group, quota in quotas.items():
+            if quota > 0:
+                reserved.update([index for index in order if spot_quota_group(candidates[index][0]) == group][:quota])
+        reserved = [index for index in order if index in reserved][:k]
+        rest = [index for index in order if index not in reserved][:k - len(reserved)]
+        selected = sorted(reserved + rest, key=lambda index: (-candidates[index][1], index))
+        return [candidates[index] for index in selected]
+
+    def test_reserves_low_scored_groups(self):
+        candidates = [({'id': str(i), 'contenttypeid': '12'}, 100.0 - i) for i in range(10)]
+        candidates.append(({'id': 'food', 'contenttypeid': '39'}, 1.0))
+        candidates.append(({'id': 'stay', 'category': '숙박'}, 0.5))
+
+        selected = select_top_k_with_quotas(candidates, 5, {'restaurant': 1, 'lodging': 1})
+
+        self.assertEqual([spot['id'] for spot, _ in selected], ['0', '1', '2', 'food', 'stay'])
+
+    def test_matches_brute_force(self):
+        rng = random.Random(11)
+        content_types = ['12', '14', '39', '32']
+        for case in range(200):
+            candidates = [
+                ({'id': str(i), 'contenttypeid': rng.choice(content_types)}, float(rng.randint(0, 8)))
+                for i in range(rng.randint(0, 30))
+            ]
+            k = rng.randint(0, 12)
+            quotas = {
+                'restaurant': rng.randint(0, 4),
+                'lodging': rng.randint(0, 4),
+                'attraction': rng.randint(0, 2),
+            }
+            with self.subTest(case=case):
+                self.assertEqual(
+                    select_top_k_with_quotas(candidates, k, quotas),
+                    self.brute_force(candidates, k, quotas),
+                )
+
+
+class FuzzyTitleIndexTests(SimpleTestCase):
+    def test_myers_distance_matches_levenshtein(self):
+        rng = random.Random(5)
+        alphabet = decompose('빙계계곡고운사') + 'ab'
+        for _ in range(500):
+            a = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 70)))
+            b = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 70)))
+            self.assertEqual(_Pattern(a).distance(b), levenshtein(a, b), (a, b))
+
+    def test_bk_tree_search_matches_linear_scan(self):
+        rng = random.Random(9)
+        keys = [''.join(rng.choice('abcde') for _ in range(rng.randint(1, 8))) for _ in range(300)]
+        tree = BKTree()
+        for row, key in enumerate(keys):
+            tree.add(key, row)
+
+        for _ in range(50):
+            query = ''.join(rng.choice('abcde') for _ in range(rng.randint(1, 8)))
+            for max_distance in range(4):
+                expected = sorted(
+                    (levenshtein(query, key), row) for row, key in enumerate(keys)
+                    if levenshtein(query, key) <= max_distance
+                )
+                self.assertEqual(sorted(tree.search(query, max_distance)), expected)
+
+    def test_search_rows_matches_brute_force(self):
+        spots = [{'title': title} for title in (
+            '빙계계곡', '빙계서원', '고운사(의성)', '의성 조문국박물관', '사촌역 은행나무',
+            '산운생태공원', '의성 점곡계곡', '운람사(의성)', '빙계얼음골 야영장',
+        )]
+        index = FuzzyTitleIndex(spots)
+
+        for query in ('빙게계곡', '고은사', '조문국 박물관', '점곡게곡', '은행나무길', '빙'):
+            key = decompose(''.join(query.split()).lower())
+            for max_distance in (0, 1, 2, 3):
+                best = {}
+                for row, spot in enumerate(spots):
+                    distance = min(levenshtein(key, title_key) for title_key in title_keys(spot['title']))
+                    if distance <= max_distance:
+                        best[row] = distance
+                expected = sorted(best.items(), key=lambda item: (item[1], item[0]))
+                self.assertEqual(index.search_rows(query, max_distance), expected, (query, max_distance))
+
+    def test_typo_finds_title(self):
+        index = FuzzyTitleIndex([{'title': '빙계계곡'}, {'title': '고운사(의성)'}])
+
+        self.assertEqual([(spot['title'], distance) for spot, distance in index.search('빙게계곡')], [('빙계계곡', 1)])
+
+
+class ItineraryPlannerTests(SimpleTestCase):
+    @staticmethod
+    def random_spots(rng, count):
+        return [
+            {'id': str(i), 'latitude': 36.2 + rng.random() * 0.4, 'longitude': 128.4 + rng.random() * 0.5}
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def path_length(distances, path):
+        return float(sum(distances[a, b] for a, b in zip(path[:-1], path[1:])))
+
+    def test_plan_is_two_opt_optimal(self):
+        rng = random.Random(17)
+        for case in range(40):
+            spots = self.random_spots(rng, rng.randint(3, 12))
+            plan = ItineraryPlanner(spots).plan(spots)
+            distances = distance_matrix_km(*spot_coordinates(spots))
+            path = [int(spot_id) for spot_id in plan['order']]
+            length = self.path_length(distances, path)
+
+            with self.subTest(case=case):
+                self.assertEqual(sorted(path), list(range(len(spots))))
+                self.assertAlmostEqual(plan['total_distance_km'], length, places=2)
+                self.assertAlmostEqual(sum(leg['distance_km'] for leg in plan['legs']), length, places=2)
+                # 최근접 이웃 경로보다 길지 않음
+                best_neighbour = min(
+                    self.path_length(distances, nearest_neighbour_path(distances, start))
+                    for start in range(len(spots))
+                )
+                self.assertLessEqual(length, best_neighbour + 1e-3)
+                # 어떤 구간을 뒤집어도 (양 끝 포함) 더 짧아지지 않음
+                for i, j in itertools.combinations(range(len(path)), 2):
+                    reversed_path = path[:i] + path[i:j + 1][::-1] + path[j + 1:]
+                    self.assertGreaterEqual(self.path_length(distances, reversed_path), length - 1e-3)
+
+    def test_plan_is_close_to_optimal_for_small_selections(self):
+        rng = random.Random(23)
+        for case in range(60):
+            spots = self.random_spots(rng, rng.randint(2, 7))
+            plan = ItineraryPlanner([]).plan(spots)
+            distances = distance_matrix_km(*spot_coordinates(spots))
+            optimal = min(
+                self.path_length(distances, path) for path in itertools.permutations(range(len(spots)))
+            )
+            with self.subTest(case=case):
+                self.assertGreaterEqual(plan['total_distance_km'], round(optimal, 3) - 1e-6)
+                self.assertLessEqual(plan['total_distance_km'], optimal * 1.1)
+
+    def test_collinear_spots_are_visited_in_order(self):
+        latitudes = [36.30, 36.35, 36.40, 36.45, 36.50, 36.55]
+        spots = [{'id': str(i), 'latitude': latitude, 'longitude': 128.5} for i, latitude in enumerate(latitudes)]
+        shuffled = spots[:]
+        random.Random(2).shuffle(shuffled)
+
+        plan = ItineraryPlanner(spots).plan(shuffled)
+
+        self.assertIn(plan['order'], (['0', '1', '2', '3', '4', '5'], ['5', '4', '3', '2', '1', '0']))
+        span = distance_matrix_km(*spot_coordinates([spots[0], spots[-1]]))[0, 1]
+        self.assertAlmostEqual(plan['total_distance_km'], span, places=2)
+
+    def test_unlocated_spots_go_last(self):
+        spots = [
+            {'id': 'a', 'latitude': 36.3, 'longitude': 128.5},
+            {'id': 'nowhere'},
+            {'id': 'b', 'latitude': 36.4, 'longitude': 128.6},
+        ]
+
+        plan = ItineraryPlanner([]).plan(spots)
+
+        self.assertEqual(plan['order'][-1], 'nowhere')
+        self.assertEqual(plan['unlocated'], ['nowhere'])
+        self.assertEqual(len(plan['legs']), 1)
+
+
+class AliasTableTests(SimpleTestCase):
+    def test_table_reproduces_weights_exactly(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            weights = [rng.choice([0.0, 0.5, 1.0, 1.2, 1.5, 1.8, 7.0]) for _ in range(rng.randint(1, 40))]
+            table = AliasTable(weights)
+            total = sum(weights) or len(weights)
+            probabilities = [table.probability[i] / table.size for i in range(table.size)]
+            for i in range(table.size):
+                probabilities[table.alias[i]] += (1.0 - table.probability[i]) / table.size
+            expected = [(weight if sum(weights) else 1.0) / total for weight in weights]
+            np.testing.assert_allclose(probabilities, expected, atol=1e-9)
+
+    def test_draw_without_duplicates(self):
+        spots = [{'id': str(i), 'category': '관광지' if i % 3 else '음식', 'firstimage': 'x' * (i % 2)}
+                 for i in range(30)]
+        feed = PachinkoFeed(spots)
+        rng = random.Random(1)
+
+        drawn = feed.draw(25, rng=rng)
+        self.assertEqual(len({spot['id'] for spot in drawn}), 25)
+
+        food = feed.draw(50, category='음식', rng=rng)
+        self.assertEqual(len(food), 10)
+        self.assertTrue(all(spot['category'] == '음식' for spot in food))
+        self.assertEqual(feed.draw(5, category='없음', rng=rng), [])
+
+
+def random_catalog(seed: int, count: int):
+    """패싯/분류 검증용 무작위 관광지"""
+    rng = random.Random(seed)
+    cat_paths = [('A01', 'A0101', 'A01010500'), ('A01', 'A0101', 'A01011200'), ('A02', 'A0201', 'A02010700'),
+                 ('A02', 'A0206'), ('B02', 'B0201', 'B02010100'), ('A05',), ()]
+    lcls_paths = [('NA', 'NA01', 'NA010100'), ('HS', 'HS01'), ('HS', 'HS02', 'HS020100'), ()]
+    spots = []
+    for row in range(count):
+        cat = rng.choice(cat_paths)
+        lcls = rng.choice(lcls_paths)
+        spots.append({
+            'id': str(row),
+            'category': rng.choice(['관광지', '음식/맛집', '숙박', '']),
+            'contenttypeid': rng.choice(['12', '14', '39', '32', '']),
+            'sigungucode': rng.choice(['1', '2', '']),
+            'firstimage': rng.choice(['image.jpg', '']),
+            'tel': rng.choice(['054-000-0000', ' ', None]),
+            'tags': rng.sample(['자연', '역사', '가족', '야경'], rng.randint(0, 2)),
+            **{field: code for field, code in zip(TAXONOMY_SYSTEMS['cat'], cat)},
+            **{field: code for field, code in zip(TAXONOMY_SYSTEMS['lcls'], lcls)},
+        })
+    return spots
+
+
+def taxonomy_path(spot, fields):
+    path = []
+    for field in fields:
+        code = str(spot.get(field) or '').strip()
+        if not code:
+            break
+        path.append(code)
+    return path
+
+
+class TaxonomyIndexTests(SimpleTestCase):
+    def test_rows_match_brute_force(self):
+        spots = random_catalog(seed=4, count=200)
+        taxonomy = TaxonomyIndex(spots)
+
+        for system, fields in TAXONOMY_SYSTEMS.items():
+            paths = [taxonomy_path(spot, fields) for spot in spots]
+            codes = {code for path in paths for code in path}
+            for code in codes:
+                expected = sorted((row for row, path in enumerate(paths) if code in path),
+                                  key=lambda row: (paths[row], row))
+                self.assertEqual(taxonomy.rows(system, code).tolist(), expected, (system, code))
+                self.assertEqual(taxonomy.rows_for_code(code.lower()).tolist(), expected)
+            self.assertEqual(taxonomy.rows(system, 'ZZ99').tolist(), [])
+
+    def test_tree_counts(self):
+        spots = random_catalog(seed=8, count=100)
+        tree = TaxonomyIndex(spots).systems['cat'].tree()
+
+        for node in tree:
+            expected = sum(1 for spot in spots if spot.get('cat1') == node['code'])
+            self.assertEqual(node['count'], expected)
+            self.assertEqual(sum(child['count'] for child in node['children']),
+                             sum(1 for spot in spots if spot.get('cat1') == node['code'] and spot.get('cat2')))
+
+
+class FacetIndexTests(SimpleTestCase):
+    @staticmethod
+    def brute_values(spot):
+        values = spot_facet_values(spot)
+        for system, fields in TAXONOMY_SYSTEMS.items():
+            values[system] = taxonomy_path(spot, fields)
+        return values
+
+    def brute_match(self, spots, filters, exclude=None):
+        rows = []
+        for row, spot in enumerate(spots):
+            values = self.brute_values(spot)
+            if all(set(values[facet]) & set(wanted) for facet, wanted in filters.items() if facet != exclude and wanted):
+                rows.append(row)
+        return rows
+
+    def test_match_and_counts_match_brute_force(self):
+        spots = random_catalog(seed=6, count=150)
+        index = FacetIndex(spots)
+        rng = random.Random(12)
+        choices = {
+            'category': ['관광지', '음식/맛집', '숙박', '기타'],
+            'contenttypeid': ['12', '39', '32'],
+            'sigungucode': ['1', '2'],
+            'has_image': ['true', 'false'],
+            'has_phone': ['true', 'false'],
+            'tags': ['자연', '역사', '가족'],
+            'cat': ['A01', 'A0201', 'B02', 'A01010500', 'A05'],
+            'lcls': ['HS', 'NA01', 'HS020100'],
+        }
+
+        for case in range(60):
+            filters = {
+                facet: rng.sample(values, rng.randint(1, 2))
+                for facet, values in rng.sample(sorted(choices.items()), rng.randint(0, 3))
+            }
+            with self.subTest(case=case, filters=filters):
+                self.assertEqual(index.rows(index.match(filters)).tolist(), self.brute_match(spots, filters))
+
+                counts = index.counts(filters)
+                for facet in FACETS:
+                    base = self.brute_match(spots, filters, exclude=facet)
+                    expected = {}
+                    for row in base:
+                        for value in self.brute_values(spots[row])[facet]:
+                            expected[value] = expected.get(value, 0) + 1
+                    self.assertEqual(counts[facet], expected)
@@ -0,0 +1,72 @@
+"""
+관광지 텍스트 벡터 - 문자 n-gram 해싱 TF-IDF
+외부 임베딩 서비스 없이 카탈로그 단위로 계산하며, 해시는 프로세스와 무관하게 고정(crc32)
+"""
+import math
+import zlib
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+DEFAULT_N_FEATURES = 2048
+DEFAULT_NGRAM_RANGE = (2, 3)
+
+
+def spot_vector_text(spot: Dict) -> str:
+    """벡터화 대상 텍스트 (제목은 가중치를 위해 두 번 포함)"""
+    title = str(spot.get('title', spot.get('name', '')))
+    return ' '.join([
+        title,
+        title,
+        str(spot.get('overview', spot.get('description', ''))),
+        ' '.join(spot.get('tags', [])),
+    ]).lower()
+
+
+class HashingTfidfVectorizer:
+    """문자 n-gram을 고정 차원으로 해싱한 TF-IDF 벡터화기"""
+
+    def __init__(self, n_features: int = DEFAULT_N_FEATURES, ngram_range=DEFAULT_NGRAM_RANGE):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.idf = np.ones(n_features, dtype=np.float32)
+
+    def _ngrams(self, text: str) -> Iterable[str]:
+        min_n, max_n = self.ngram_range
+        for word in text.split():
+            padded = f' {word} '
+            for n in range(min_n, max_n + 1):
+                for i in range(len(padded) - n + 1):
+                    yield padded[i:i + n]
+
+    def _hashed_counts(self, text: str) -> Dict[int, float]:
+        counts: Dict[int, float] = {}
+        for gram in self._ngrams(text):
+            bucket = zlib.crc32(gram.encode('utf-8')) % self.n_features
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+        return counts
+
+    def _term_frequency(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for bucket, count in self._hashed_counts(text).items():
+                # 로그 스케일 TF로 긴 개요의 영향 완화
+                matrix[row, bucket] = 1.0 + math.log(count)
+        return matrix
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def fit_transform(self, texts: List[str]) -> np.ndarray:
+        """IDF를 학습하고 L2 정규화된 TF-IDF 행렬 반환"""
+        tf = self._term_frequency(texts)
+        document_frequency = np.count_nonzero(tf, axis=0)
+        self.idf = (np.log((1.0 + len(texts)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        return self._normalize(tf * self.idf)
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """학습된 IDF로 L2 정규화된 TF-IDF 행렬 반환"""
+        return self._normalize(self._term_frequency(texts) * self.idf)
@@ -0,0 +1,164 @@
+"""
+관광지 벡터 인덱스 - 문자 n-gram 해싱 TF-IDF (+ 선택적 SVD 차원 축소)
+오프라인(build_vector_index 명령)으로 생성해 디스크에 저장하고, 서버에서는 float32 행렬을 memmap으로 읽어
+쿼리 벡터와의 행렬-벡터 곱 한 번으로 전체 관광지 점수를 계산
+"""
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .text_vectors import HashingTfidfVectorizer, spot_vector_text
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = 'vectors.npy'
+IDF_FILE = 'idf.npy'
+COMPONENTS_FILE = 'components.npy'
+META_FILE = 'meta.json'
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class SpotVectorIndex:
+    """관광지 ID 목록과 정규화된 float32 벡터 행렬"""
+
+    def __init__(self, spot_ids: List[str], vectors: np.ndarray, vectorizer: HashingTfidfVectorizer,
+                 components: Optional[np.ndarray] = None, catalog_version: str = ''):
+        self.spot_ids = spot_ids
+        self.vectors = vectors
+        self.vectorizer = vectorizer
+        self.components = components
+        self.catalog_version = catalog_version
+
+    @classmethod
+    def build(cls, spots: List[Dict], n_components: int = 0, catalog_version: str = '') -> 'SpotVectorIndex':
+        """관광지 목록으로 인덱스 생성 (n_components > 0이면 SVD로 차원 축소)"""
+        vectorizer = HashingTfidfVectorizer()
+        matrix = vectorizer.fit_transform([spot_vector_text(spot) for spot in spots])
+
+        components = None
+        rank = min(n_components, *matrix.shape) if n_components > 0 else 0
+        if rank > 0:
+            # 잠재 의미 공간: 같이 등장하는 n-gram을 묶어 글자가 겹치지 않는 쿼리도 매칭
+            _, _, vt = np.linalg.svd(matrix, full_matrices=False)
+            components = vt[:rank].T.astype(np.float32)
+            matrix = matrix @ components
+
+        spot_ids = [str(spot.get('id', spot.get('contentid', ''))) for spot in spots]
+        return cls(spot_ids, _normalize_rows(matrix), vectorizer, components, catalog_version)
+
+    def save(self, directory: str):
+        """인덱스를 디렉터리에 저장"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, VECTORS_FILE), np.ascontiguousarray(self.vectors, dtype=np.float32))
+        np.save(os.path.join(directory, IDF_FILE), self.vectorizer.idf.astype(np.float32))
+        components_path = os.path.join(directory, COMPONENTS_FILE)
+        if self.components is not None:
+            np.save(components_path, self.components.astype(np.float32))
+        elif os.path.exists(components_path):
+            os.remove(components_path)
+
+        # 메타데이터를 마지막에 기록하여 불완전한 인덱스를 읽지 않도록 함
+        meta = {
+            'catalog_version': self.catalog_version,
+            'spot_ids': self.spot_ids,
+            'n_features': self.vectorizer.n_features,
+            'ngram_range': list(self.vectorizer.ngram_range),
+            'n_components': 0 if self.components is None else int(self.components.shape[1]),
+        }
+        with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str) -> 'SpotVectorIndex':
+        """디스크의 인덱스 읽기 (벡터 행렬은 memmap)"""
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        vectorizer = HashingTfidfVectorizer(meta['n_features'], tuple(meta['ngram_range']))
+        vectorizer.idf = np.load(os.path.join(directory, IDF_FILE))
+        components = None
+        if meta.get('n_components'):
+            components = np.load(os.path.join(directory, COMPONENTS_FILE))
+        vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode='r')
+
+        if vectors.shape[0] != len(meta['spot_ids']):
+            raise ValueError(f'벡터 수({vectors.shape[0]})와 관광지 ID 수({len(meta["spot_ids"])})가 다릅니다')
+        return cls(meta['spot_ids'], vectors, vectorizer, components, meta.get('catalog_version', ''))
+
+    def __len__(self) -> int:
+        return len(self.spot_ids)
+
+    def embed(self, text: str) -> np.ndarray:
+        """쿼리 텍스트를 인덱스 공간의 정규화 벡터로 변환"""
+        vector = self.vectorizer.transform([text.lower()])[0]
+        if self.components is not None:
+            vector = vector @ self.components
+        return _normalize_rows(vector)
+
+    def search(self, text: str, k: int, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """코사인 유사도 상위 k개 (관광지 ID, 점수)"""
+        if not self.spot_ids or k <= 0:
+            return []
+
+        scores = self.vectors @ self.embed(text)
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.spot_ids[i], float(scores[i])) for i in top if scores[i] > min_score]
+
+    def search_catalog(self, catalog, text: str, limit: int, min_score: float = 0.0,
+                       exclude_ids=()) -> List[Tuple[Dict, float]]:
+        """카탈로그 관광지로 변환한 검색 결과 (관광지, 점수), 카탈로그에 없는 ID와 exclude_ids는 제외"""
+        if limit <= 0:
+            return []
+        if self.catalog_version != catalog.version:
+            logger.warning(f'벡터 인덱스 버전({self.catalog_version})이 카탈로그({catalog.version})와 다릅니다')
+
+        results = []
+        for spot_id, score in self.search(text, limit + len(exclude_ids), min_score):
+            spot = catalog.get_spot(spot_id)
+            if spot is None or spot_id in exclude_ids:
+                continue
+            results.append((spot, score))
+            if len(results) >= limit:
+                break
+        return results
+
+
+_loaded_indexes: Dict[str, Tuple[float, Optional[SpotVectorIndex]]] = {}
+_load_lock = threading.Lock()
+
+
+def load_vector_index(directory: str) -> Optional[SpotVectorIndex]:
+    """디스크 인덱스를 한 번만 읽어 재사용 (메타 파일이 바뀌면 다시 읽음), 없으면 None"""
+    meta_path = os.path.join(directory, META_FILE)
+    try:
+        modified = os.path.getmtime(meta_path)
+    except OSError:
+        return None
+
+    cached = _loaded_indexes.get(directory)
+    if cached and cached[0] == modified:
+        return cached[1]
+
+    with _load_lock:
+        cached = _loaded_indexes.get(directory)
+        if cached and cached[0] == modified:
+            return cached[1]
+        try:
+            index = SpotVectorIndex.load(directory)
+            logger.info(f'벡터 인덱스 로드: {len(index)}개 관광지 (version={index.catalog_version})')
+        except Exception as e:
+            logger.error(f'벡터 인덱스 로드 실패: {e}')
+            index = None
+        _loaded_indexes[directory] = (modified, index)
+        return index
@@ -65,7 +65,7 @@ MIDDLEWARE = [
 # REST Framework 설정
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -148,6 +148,66 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 GOOGLE_APPLICATION_CREDENTIALS = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 
+# Gemini 컨텍스트 캐시 (시스템 지시문 + 카탈로그 프리픽스 재사용)
+GEMINI_CONTEXT_CACHE_ENABLED = os.environ.get('GEMINI_CONTEXT_CACHE_ENABLED', 'True') == 'True'
+GEMINI_CONTEXT_CACHE_TTL = int(os.environ.get('GEMINI_CONTEXT_CACHE_TTL', 3600))
+# 교체된 캐시 핸들 삭제 유예 시간(초) - 진행 중인 생성 호출이 끝날 때까지 유지
+GEMINI_CONTEXT_CACHE_RETIRE_GRACE = int(os.environ.get('GEMINI_CONTEXT_CACHE_RETIRE_GRACE', 300))
+
+# 대용량 후보 재순위 (map-reduce): 청크 크기, 동시 호출 수, 요청당 최대 호출 수
+GEMINI_RERANK_CHUNK_SIZE = int(os.environ.get('GEMINI_RERANK_CHUNK_SIZE', 80))
+GEMINI_RERANK_MAX_CONCURRENCY = int(os.environ.get('GEMINI_RERANK_MAX_CONCURRENCY', 4))
+GEMINI_RERANK_MAX_CALLS = int(os.environ.get('GEMINI_RERANK_MAX_CALLS', 8))
+
+# Firestore 컬렉션 스트리밍 조회 페이지 크기
+FIRESTORE_PAGE_SIZE = int(os.environ.get('FIRESTORE_PAGE_SIZE', 500))
+
+# 관광지 목록 API (/api/spots/) 기본 페이지 크기와 최대 페이지 크기
+SPOTS_PAGE_SIZE = int(os.environ.get('SPOTS_PAGE_SIZE', 50))
+SPOTS_MAX_PAGE_SIZE = int(os.environ.get('SPOTS_MAX_PAGE_SIZE', 200))
+
+# 관광지 목록/상세/검색 응답 Cache-Control max-age (초), 이후에는 ETag로 조건부 요청
+API_CACHE_MAX_AGE = int(os.environ.get('API_CACHE_MAX_AGE', 60))
+
+# 데이터베이스 통계 카운터 문서 (system_stats/counters): 사용 여부, count() 재집계 주기 (초)
+DATABASE_STATS_COUNTERS_ENABLED = os.environ.get('DATABASE_STATS_COUNTERS_ENABLED', 'False') == 'True'
+DATABASE_STATS_STALENESS = int(os.environ.get('DATABASE_STATS_STALENESS', 300))
+
+# 관광지 카탈로그 메모리 캐시 유효 시간 (초)
+TOURISM_CATALOG_TTL = int(os.environ.get('TOURISM_CATALOG_TTL', 300))
+
+# 추천 결과 개수 및 카테고리별 최소 개수 (contenttypeid/category 기준 그룹)
+RECOMMENDATION_RESULT_SIZE = int(os.environ.get('RECOMMENDATION_RESULT_SIZE', 15))
+RECOMMENDATION_CATEGORY_QUOTAS = {
+    'restaurant': int(os.environ.get('RECOMMENDATION_MIN_RESTAURANTS', 5)),
+    'lodging': int(os.environ.get('RECOMMENDATION_MIN_LODGINGS', 5)),
+    'attraction': int(os.environ.get('RECOMMENDATION_MIN_ATTRACTIONS', 5)),
+}
+
+# 다양성 재순위(MMR): 1.0이면 관련성만, 낮을수록 비슷한 관광지를 더 강하게 배제
+RECOMMENDATION_MMR_LAMBDA = float(os.environ.get('RECOMMENDATION_MMR_LAMBDA', 0.7))
+RECOMMENDATION_MMR_POOL_SIZE = int(os.environ.get('RECOMMENDATION_MMR_POOL_SIZE', 60))
+
+# 위치 기반 가중치: 사용자 위치에서 SCALE_KM 떨어지면 1/e로 감소, 최대 WEIGHT점 가산
+RECOMMENDATION_DISTANCE_WEIGHT = float(os.environ.get('RECOMMENDATION_DISTANCE_WEIGHT', 20.0))
+RECOMMENDATION_DISTANCE_SCALE_KM = float(os.environ.get('RECOMMENDATION_DISTANCE_SCALE_KM', 5.0))
+
+# 배치 쿼리 (/api/query/batch/) 최대 쿼리 수 및 Gemini 호출당 묶음 분석 쿼리 수
+BATCH_QUERY_MAX_SIZE = int(os.environ.get('BATCH_QUERY_MAX_SIZE', 50))
+GEMINI_BATCH_ANALYSIS_SIZE = int(os.environ.get('GEMINI_BATCH_ANALYSIS_SIZE', 10))
+
+# 벡터 검색 인덱스 (manage.py build_vector_index로 생성): 저장 경로, SVD 차원, 최소 유사도
+TOURISM_VECTOR_INDEX_PATH = os.environ.get('TOURISM_VECTOR_INDEX_PATH', os.path.join(BASE_DIR, 'vector_index'))
+TOURISM_VECTOR_INDEX_COMPONENTS = int(os.environ.get('TOURISM_VECTOR_INDEX_COMPONENTS', 128))
+RECOMMENDATION_VECTOR_MIN_SCORE = float(os.environ.get('RECOMMENDATION_VECTOR_MIN_SCORE', 0.1))
+
+# Gemini 재순위 후보 수 (로컬 점수 상위 + 벡터 검색 상위 RECOMMENDATION_VECTOR_CANDIDATES개)
+RECOMMENDATION_CANDIDATE_POOL_SIZE = int(os.environ.get('RECOMMENDATION_CANDIDATE_POOL_SIZE', 80))
+RECOMMENDATION_VECTOR_CANDIDATES = int(os.environ.get('RECOMMENDATION_VECTOR_CANDIDATES', 20))
+
+# 관광지 조합별 여행 설명 캐시 유효 시간 (초, 기본 7일)
+TRAVEL_DESCRIPTION_CACHE_TTL = int(os.environ.get('TRAVEL_DESCRIPTION_CACHE_TTL', 60 * 60 * 24 * 7))
+
 # Google OAuth 설정
 GOOGLE_OAUTH2_CLIENT_ID = os.getenv('GOOGLE_OAUTH2_CLIENT_ID')
 GOOGLE_OAUTH2_CLIENT_SECRET = os.getenv('GOOGLE_OAUTH2_CLIENT_SECRET')